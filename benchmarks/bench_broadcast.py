@@ -0,0 +1,212 @@
+"""
+End-to-end broadcast throughput against the offline Bot API stand-in.
+
+Starts benchmarks/fake_bot_api.py in a separate process (so its CPU
+is not counted), points aiogram's Bot at it and runs broadcast_message
+for each chat count. Reports msgs/s, p50/p99 send latency, CPU time
+and peak RSS of the bot process.
+
+With --db the broadcast runs as a durable job (deliveries checkpointed
+to PostgreSQL from the usual DB_* settings); the job is deleted afterwards.
+
+Usage:
+    python benchmarks/bench_broadcast.py [--chats 1000 10000 100000]
+        [--rate 100000] [--latency 30] [--jitter 10] [--error-rate 0.01]
+        [--global-limit 0] [--chat-interval 0] [--db]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Broadcast throughput benchmark")
+    parser.add_argument("--chats", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--rate", type=float, default=100_000,
+                        help="BROADCAST_RATE for the run (msgs/s)")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=30, help="fake API latency, ms")
+    parser.add_argument("--jitter", type=float, default=10, help="fake API jitter, ms")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--blocked-rate", type=float, default=0)
+    parser.add_argument("--global-limit", type=int, default=0)
+    parser.add_argument("--chat-interval", type=float, default=0)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--db", action="store_true", help="run as a durable job")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# Limiter settings are read at import time
+os.environ.setdefault("BOT_TOKEN", "123456:benchmark")
+os.environ["BROADCAST_RATE"] = str(args.rate)
+os.environ["BROADCAST_CHAT_INTERVAL"] = "0"
+os.environ["BROADCAST_CHECKPOINT_INTERVAL"] = "1"
+if args.concurrency:
+    os.environ["BROADCAST_CONCURRENCY"] = str(args.concurrency)
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import Chat, Message
+
+from utils.broadcast import broadcast_message
+from utils.payload import PreparedRequest
+
+# Send latency, collected around every API call
+latencies = []
+_send = PreparedRequest.send
+
+
+async def timed_send(self, chat_id: int):
+    start = time.perf_counter()
+    try:
+        return await _send(self, chat_id)
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+PreparedRequest.send = timed_send
+
+
+def start_fake_api() -> subprocess.Popen:
+    process = subprocess.Popen([
+        sys.executable, os.path.join(ROOT, "benchmarks", "fake_bot_api.py"),
+        "--port", str(args.port),
+        "--latency", str(args.latency),
+        "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate),
+        "--blocked-rate", str(args.blocked_rate),
+        "--global-limit", str(args.global_limit),
+        "--chat-interval", str(args.chat_interval)
+    ])
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection(("127.0.0.1", args.port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError("fake Bot API did not start")
+
+
+def percentile(values, share: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run_job(bot: Bot, db, chat_ids, message: Message):
+    from utils.jobs import deliver_job_chats
+
+    job_id = await db.create_broadcast_job(
+        admin_id=0,
+        source_chat_id=message.chat.id,
+        source_message_id=message.message_id,
+        send_mode="copy",
+        chat_ids=chat_ids
+    )
+    try:
+        job = await db.get_broadcast_job(job_id)
+        await deliver_job_chats(bot, db, job, chat_ids)
+        job = await db.get_broadcast_job(job_id)
+        return {"total": job["total"], "success": job["success"], "failed": job["failed"]}
+    finally:
+        await db.execute("DELETE FROM broadcast_jobs WHERE id = $1", job_id)
+
+
+async def bench(bot: Bot, db, chats: int) -> dict:
+    message = Message(
+        message_id=10,
+        date=datetime.now(),
+        chat=Chat(id=42, type="private"),
+        text="benchmark"
+    )
+    chat_ids = list(range(-1_000_000_000_000 - chats, -1_000_000_000_000))
+
+    latencies.clear()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+
+    if db:
+        stats = await run_job(bot, db, chat_ids, message)
+    else:
+        stats = await broadcast_message(bot, [{"chat_id": c} for c in chat_ids], message)
+
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    return {
+        "chats": chats,
+        "success": stats["success"],
+        "failed": stats["failed"],
+        "seconds": wall,
+        "msgs_s": chats / wall,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "cpu_s": cpu,
+        "cpu_us_msg": cpu / chats * 1e6,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+async def main():
+    fake_api = start_fake_api()
+
+    bot = Bot(
+        token=os.environ["BOT_TOKEN"],
+        session=AiohttpSession(
+            api=TelegramAPIServer.from_base(f"http://127.0.0.1:{args.port}")
+        )
+    )
+
+    db = None
+    if args.db:
+        from database import init_db
+        db = await init_db()
+
+    try:
+        print(
+            f"{'chats':>8} {'ok':>8} {'failed':>7} {'time s':>8} {'msgs/s':>9} "
+            f"{'p50 ms':>7} {'p99 ms':>7} {'CPU s':>7} {'µs/msg':>7} {'RSS MB':>7}"
+        )
+        for chats in sorted(args.chats):
+            r = await bench(bot, db, chats)
+            print(
+                f"{r['chats']:>8} {r['success']:>8} {r['failed']:>7} {r['seconds']:>8.2f} "
+                f"{r['msgs_s']:>9.0f} {r['p50_ms']:>7.1f} {r['p99_ms']:>7.1f} "
+                f"{r['cpu_s']:>7.2f} {r['cpu_us_msg']:>7.0f} {r['peak_rss_mb']:>7.1f}"
+            )
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+        writer.write(b"GET /stats HTTP/1.0\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        print("fake API:", json.loads(response.split(b"\r\n\r\n", 1)[1]))
+
+    finally:
+        await bot.session.close()
+        if db:
+            from database import close_db
+            await close_db()
+        fake_api.terminate()
+        fake_api.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""
+Per-send CPU cost of building a broadcast request.
+
+before: what aiogram does for every recipient
+        (new method object → pydantic validation → form encoding)
+after:  PreparedRequest, serialized once, chat_id patched per send
+
+Usage:
+    python benchmarks/bench_payload.py [sends]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "123456:benchmark")
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.methods import CopyMessage
+
+from utils.payload import PreparedRequest
+
+
+def bench_before(bot: Bot, sends: int) -> float:
+    session = bot.session
+    start = time.process_time()
+
+    for chat_id in range(-sends, 0):
+        method = CopyMessage(chat_id=chat_id, from_chat_id=42, message_id=10)
+        session.build_form_data(bot=bot, method=method)
+
+    return time.process_time() - start
+
+
+def bench_after(bot: Bot, sends: int) -> float:
+    prepared = PreparedRequest(
+        bot,
+        CopyMessage(chat_id=0, from_chat_id=42, message_id=10)
+    )
+    start = time.process_time()
+
+    for chat_id in range(-sends, 0):
+        prepared.body(chat_id)
+
+    return time.process_time() - start
+
+
+def main():
+    sends = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    bot = Bot(
+        token=os.environ["BOT_TOKEN"],
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+    )
+
+    before = bench_before(bot, sends)
+    after = bench_after(bot, sends)
+
+    print(f"sends:  {sends}")
+    print(f"before: {before:.3f}s CPU  ({before / sends * 1e6:.2f} µs/send)")
+    print(f"after:  {after:.3f}s CPU  ({after / sends * 1e6:.2f} µs/send)")
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
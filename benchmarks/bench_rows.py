@@ -0,0 +1,95 @@
+"""
+Memory per fetched chat row.
+
+before: Records copied into dicts ([dict(r) for r in rows])
+after:  ChatRow records as asyncpg decodes them, no copy
+
+Rows come from a temporary copy of the chats table filled with
+generated chats, so the real table is not touched. Connects with
+the usual DB_* settings, or --dsn.
+
+Usage:
+    python benchmarks/bench_rows.py [--chats 100000] [--dsn postgresql://...]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("BOT_TOKEN", "123456:benchmark")
+
+import asyncpg
+
+from database.rows import ChatRow
+
+QUERY = "SELECT * FROM bench_chats ORDER BY added_date DESC"
+
+
+async def fill(conn: asyncpg.Connection, chats: int):
+    await conn.execute("CREATE TEMP TABLE bench_chats (LIKE chats INCLUDING DEFAULTS)")
+    await conn.execute("""
+        INSERT INTO bench_chats (id, chat_id, chat_type, title, username, is_active)
+        SELECT
+            g,
+            -1000000000000 - g,
+            (ARRAY['channel', 'group', 'supergroup'])[g % 3 + 1],
+            'Chat title number ' || g,
+            CASE WHEN g % 2 = 0 THEN 'chat_' || g END,
+            TRUE
+        FROM generate_series(1, $1) g
+    """, chats)
+
+
+async def measure(fetch) -> int:
+    """Peak bytes allocated while `fetch` runs"""
+    gc.collect()
+    tracemalloc.start()
+
+    rows = await fetch()
+    _, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del rows
+    return peak
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Row memory benchmark")
+    parser.add_argument("--chats", type=int, default=100_000)
+    parser.add_argument("--dsn", default=None, help="defaults to config.DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.dsn is None:
+        from config import DATABASE_URL
+        args.dsn = DATABASE_URL
+
+    conn = await asyncpg.connect(args.dsn)
+
+    try:
+        await fill(conn, args.chats)
+
+        async def before():
+            return [dict(r) for r in await conn.fetch(QUERY)]
+
+        async def after():
+            return await conn.fetch(QUERY, record_class=ChatRow)
+
+        # Warm-up: codecs and statement cache are not counted
+        await conn.fetch(QUERY)
+
+        print(f"{args.chats} chats, peak memory of one fetch")
+        print(f"{'':>8} {'MB':>8} {'B/row':>7}")
+
+        for name, fetch in (("before", before), ("after", after)):
+            peak = await measure(fetch)
+            print(f"{name:>8} {peak / 2**20:>8.1f} {peak / args.chats:>7.0f}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
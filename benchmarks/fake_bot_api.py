@@ -0,0 +1,206 @@
+"""
+Offline stand-in for the Telegram Bot API, for broadcast benchmarks.
+
+aiogram's Bot can point at it:
+
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base("http://127.0.0.1:8081"))
+    bot = Bot(token, session=session)
+
+Simulates:
+  - response latency (base + random jitter)
+  - random server errors (500) and "bot was blocked" errors (403)
+  - a global rate limit and a per-chat interval, both answered
+    with 429 and `retry_after`, like the real API
+
+Usage:
+    python benchmarks/fake_bot_api.py [--port 8081] [--latency 30] [--jitter 10]
+        [--error-rate 0.01] [--blocked-rate 0.01]
+        [--global-limit 30] [--chat-interval 0]
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from typing import Deque, Dict
+
+from aiohttp import web
+
+
+class FakeBotAPI:
+    """Bot API stand-in with configurable latency, errors and limits"""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        blocked_rate: float = 0.0,
+        global_limit: int = 0,
+        chat_interval: float = 0.0,
+        retry_after: int = 1
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.blocked_rate = blocked_rate
+        self.global_limit = global_limit
+        self.chat_interval = chat_interval
+        self.retry_after = retry_after
+
+        self.stats: Counter = Counter()
+        self._recent: Deque[float] = deque()
+        self._chat_last: Dict[int, float] = {}
+        self._message_id = 0
+
+    # =====================
+    # LIMITS
+    # =====================
+
+    def _global_flood(self, now: float) -> bool:
+        if not self.global_limit:
+            return False
+
+        while self._recent and self._recent[0] <= now - 1:
+            self._recent.popleft()
+
+        if len(self._recent) >= self.global_limit:
+            return True
+
+        self._recent.append(now)
+        return False
+
+    def _chat_flood(self, chat_id: int, now: float) -> bool:
+        if not self.chat_interval:
+            return False
+
+        last = self._chat_last.get(chat_id)
+        if last is not None and now - last < self.chat_interval:
+            return True
+
+        self._chat_last[chat_id] = now
+        return False
+
+    # =====================
+    # RESPONSES
+    # =====================
+
+    @staticmethod
+    def _error(code: int, description: str, **parameters) -> web.Response:
+        payload = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            payload["parameters"] = parameters
+        return web.json_response(payload, status=code)
+
+    def _next_message(self, chat_id: int, data: dict) -> dict:
+        self._message_id += 1
+        return {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup" if chat_id < 0 else "private"},
+            "text": data.get("text", "")
+        }
+
+    def _result(self, method: str, chat_id: int, data: dict):
+        method = method.lower()
+
+        if method == "getme":
+            return {"id": 1, "is_bot": True, "first_name": "Fake bot", "username": "fake_bot"}
+
+        if method == "copymessage":
+            self._message_id += 1
+            return {"message_id": self._message_id}
+
+        if method in ("copymessages", "forwardmessages"):
+            count = data.get("message_ids", "").count(",") + 1
+            start = self._message_id + 1
+            self._message_id += count
+            return [{"message_id": i} for i in range(start, start + count)]
+
+        if method.startswith(("delete", "edit", "answer", "pin", "unpin")):
+            return True
+
+        return self._next_message(chat_id, data)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = dict(await request.post())
+        self.stats["requests"] += 1
+
+        try:
+            chat_id = int(data.get("chat_id", 0))
+        except ValueError:
+            chat_id = 0
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+
+        if self._global_flood(now) or self._chat_flood(chat_id, now):
+            self.stats["429"] += 1
+            return self._error(
+                429,
+                f"Too Many Requests: retry after {self.retry_after}",
+                retry_after=self.retry_after
+            )
+
+        roll = random.random()
+
+        if roll < self.error_rate:
+            self.stats["500"] += 1
+            return self._error(500, "Internal Server Error")
+
+        if roll < self.error_rate + self.blocked_rate:
+            self.stats["403"] += 1
+            return self._error(403, "Forbidden: bot was blocked by the user")
+
+        self.stats["ok"] += 1
+        return web.json_response({"ok": True, "result": self._result(method, chat_id, data)})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline Telegram Bot API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0, help="base latency, ms")
+    parser.add_argument("--jitter", type=float, default=0, help="random extra latency, ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of 500 answers")
+    parser.add_argument("--blocked-rate", type=float, default=0, help="share of 403 answers")
+    parser.add_argument("--global-limit", type=int, default=0, help="requests/s, 0 = off")
+    parser.add_argument("--chat-interval", type=float, default=0, help="seconds per chat, 0 = off")
+    parser.add_argument("--retry-after", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    api = FakeBotAPI(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        blocked_rate=args.blocked_rate,
+        global_limit=args.global_limit,
+        chat_interval=args.chat_interval,
+        retry_after=args.retry_after
+    )
+
+    web.run_app(api.app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
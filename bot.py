@@ -1,14 +1,18 @@
 import asyncio
 import logging
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
 from middlewares.block import BlockGroupMessagesMiddleware
 
 import config
-from database import init_db, close_db
+from database import init_db, close_db, PostgresStorage
+from utils import resume_unfinished_jobs
+from utils.broadcast import DeliveryEngine
+from utils.scheduler import BroadcastScheduler
+from utils.user_writer import UserWriter
+from handlers.start import notify_new_users
 from handlers import (
     start_router,
     chat_member_router,
@@ -16,7 +20,8 @@ from handlers import (
     broadcast_router,
     admin_router,
     users_router,
-    delete_chat
+    delete_chat,
+    search_router
 )
 
 # =====================
@@ -35,15 +40,21 @@ async def notify_super_admins(bot: Bot, db, text: str):
     """
     try:
         super_admins = await db.get_all_super_admins()
-        for admin in super_admins:
-            try:
-                await bot.send_message(admin["user_id"], text)
-            except Exception as e:
-                logger.warning(
-                    f"Failed to send message to super admin {admin['user_id']}: {e}"
-                )
     except Exception as e:
         logger.error(f"Failed to fetch super admins: {e}")
+        return
+
+    def on_result(chat_id: int, ok: bool, result):
+        if not ok:
+            logger.warning(f"Failed to send message to super admin {chat_id}: {result}")
+
+    # Priority lane: goes out ahead of running broadcasts
+    engine = DeliveryEngine(
+        lambda chat_id: bot.send_message(chat_id, text),
+        on_result=on_result,
+        priority=True
+    )
+    await engine.run(admin["user_id"] for admin in super_admins)
 
 
 async def main():
@@ -56,7 +67,14 @@ async def main():
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
 
-    dp = Dispatcher(storage=MemoryStorage())
+    # =====================
+    # DATABASE
+    # =====================
+    db = await init_db()
+
+    # FSM state survives restarts and is shared between processes
+    dp = Dispatcher(storage=PostgresStorage(db.pool))
+    dp["db"] = db
 
     # =====================
     # MIDDLEWARES
@@ -64,11 +82,15 @@ async def main():
     dp.message.middleware(BlockGroupMessagesMiddleware())
     dp.callback_query.middleware(BlockGroupMessagesMiddleware())
 
-    # =====================
-    # DATABASE
-    # =====================
-    db = await init_db()
-    dp["db"] = db
+    # Optional write-behind buffer for /start registrations
+    user_writer = None
+    if config.USER_WRITE_BUFFER:
+        user_writer = UserWriter(
+            db,
+            on_new=lambda users: notify_new_users(bot, db, users)
+        )
+        await user_writer.start()
+        dp["user_writer"] = user_writer
 
     # =====================
     # ROUTERS
@@ -80,6 +102,23 @@ async def main():
     dp.include_router(users_router)
     dp.include_router(delete_chat)
     dp.include_router(admin_router)
+    dp.include_router(search_router)
+
+    # =====================
+    # UNFINISHED BROADCASTS
+    # =====================
+    # Jobs queued for sender workers are left to them
+    resumed = await resume_unfinished_jobs(bot, db)
+    if resumed:
+        logger.info(f"♻️ Resumed {resumed} unfinished broadcast(s)")
+
+    # =====================
+    # SCHEDULED BROADCASTS
+    # =====================
+    scheduler = BroadcastScheduler(bot, db)
+    dp["scheduler"] = scheduler
+    scheduled = await scheduler.start()
+    logger.info(f"⏰ Loaded {scheduled} scheduled broadcast(s)")
 
     logger.info("🚀 Bot is starting...")
 
@@ -87,6 +126,9 @@ async def main():
         await dp.start_polling(bot)
 
     finally:
+        await scheduler.stop()
+        if user_writer:
+            await user_writer.stop()
         await close_db()
         await bot.session.close()
         logger.info("👋 Bot has been stopped")
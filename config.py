@@ -25,6 +25,62 @@ DATABASE_URL = (
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
+# Admin roles are cached in memory and reloaded every N seconds
+# (changes made by this process apply immediately)
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", 30))
+
+# FSM state lives in PostgreSQL; recent keys are cached in memory for
+# FSM_CACHE_TTL seconds (keep it short when several bot processes run)
+FSM_CACHE_SIZE = int(os.getenv("FSM_CACHE_SIZE", 1000))
+FSM_CACHE_TTL = float(os.getenv("FSM_CACHE_TTL", 2))
+
+# =========================
+# Broadcast delivery
+# =========================
+# Global send rate for the whole bot (Telegram allows ~30 msg/s)
+BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", 25))
+# Number of concurrent senders inside one broadcast
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", 16))
+# Minimum seconds between two messages to the same group / channel
+BROADCAST_CHAT_INTERVAL = float(os.getenv("BROADCAST_CHAT_INTERVAL", 3))
+# Delivery attempts per chat before it is counted as failed
+BROADCAST_MAX_ATTEMPTS = int(os.getenv("BROADCAST_MAX_ATTEMPTS", 5))
+# Delivery progress is saved every N results or every N seconds
+BROADCAST_CHECKPOINT_BATCH = int(os.getenv("BROADCAST_CHECKPOINT_BATCH", 500))
+BROADCAST_CHECKPOINT_INTERVAL = float(os.getenv("BROADCAST_CHECKPOINT_INTERVAL", 2))
+# This many "chat not found" errors in a row mean the source message is
+# unreadable, not that the chats are gone: none of them is deactivated
+BROADCAST_NOT_FOUND_STREAK = int(os.getenv("BROADCAST_NOT_FOUND_STREAK", 20))
+# Minimum seconds between two edits of the live progress message
+BROADCAST_PROGRESS_INTERVAL = float(os.getenv("BROADCAST_PROGRESS_INTERVAL", 5))
+
+# Scheduled broadcasts: target chats are resolved this many seconds early
+SCHEDULE_PREFETCH = float(os.getenv("SCHEDULE_PREFETCH", 30))
+
+# =========================
+# User registration
+# =========================
+# Buffer /start registrations and write them in batches instead of
+# one query per /start (new-user notices arrive after the flush)
+USER_WRITE_BUFFER = os.getenv("USER_WRITE_BUFFER", "0") == "1"
+USER_WRITE_BATCH = int(os.getenv("USER_WRITE_BATCH", 1000))
+USER_WRITE_INTERVAL = float(os.getenv("USER_WRITE_INTERVAL", 0.3))
+# The users list total is recounted at most every N seconds
+USER_COUNT_TTL = float(os.getenv("USER_COUNT_TTL", 60))
+
+# =========================
+# Sender workers
+# =========================
+# When enabled the polling process only enqueues broadcasts and
+# sender_worker.py processes deliver them. Workers run on BOT_TOKEN:
+# messages are copied from the admin's chat with this bot, which no other
+# bot can read. Split BROADCAST_RATE between the workers.
+BROADCAST_EXTERNAL_SENDERS = os.getenv("BROADCAST_EXTERNAL_SENDERS", "0") == "1"
+SENDER_BATCH_SIZE = int(os.getenv("SENDER_BATCH_SIZE", 500))
+SENDER_POLL_INTERVAL = float(os.getenv("SENDER_POLL_INTERVAL", 1))
+# Claims older than this (seconds) are treated as lost and re-queued
+SENDER_CLAIM_TIMEOUT = int(os.getenv("SENDER_CLAIM_TIMEOUT", 300))
+
 # =========================
 # Validation (optional but recommended)
 # =========================
@@ -1,3 +1,8 @@
 from database.db import init_db, close_db, db
+from database.fsm_storage import PostgresStorage
+from database.rows import AdminRow, BroadcastRow, ChatRow, UserRow
 
-__all__ = ['init_db', 'close_db', 'db']
+__all__ = [
+    'init_db', 'close_db', 'db', 'PostgresStorage',
+    'AdminRow', 'BroadcastRow', 'ChatRow', 'UserRow'
+]
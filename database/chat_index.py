@@ -0,0 +1,156 @@
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+_WORD = re.compile(r"\w+")
+
+
+class ChatRecord:
+    """One active chat as kept in memory (no per-instance __dict__)"""
+
+    __slots__ = ("chat_id", "chat_type", "title", "username")
+
+    def __init__(self, chat_id: int, chat_type: str, title: Optional[str], username: Optional[str] = None):
+        self.chat_id = chat_id
+        self.chat_type = chat_type
+        self.title = title or ""
+        self.username = username
+
+    def as_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.casefold())
+
+
+def _prefix_grams(word: str) -> Set[str]:
+    """Trigrams of a word padded at the start: shared by all its prefixes"""
+    padded = "  " + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _inner_grams(word: str) -> Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class ChatIndex:
+    """
+    In-memory search over active chat titles and usernames.
+
+    Every word is indexed by its trigrams, padded at the start, so a
+    query word matches both word prefixes ("ne" → "News") and
+    substrings of 3+ letters ("ews" → "News"). A lookup intersects a
+    few id sets instead of scanning all chats.
+
+    `chats` is shared with the ChatRegistry that owns the records;
+    the index only keeps texts and trigrams.
+    """
+
+    def __init__(self, chats: Dict[int, ChatRecord]):
+        self.chats = chats
+        self._texts: Dict[int, str] = {}
+        self._grams: Dict[str, Set[int]] = defaultdict(set)
+
+    def clear(self):
+        self._texts.clear()
+        self._grams.clear()
+
+    # =====================
+    # UPDATES
+    # =====================
+
+    def add(self, chat: ChatRecord):
+        chat_id = chat.chat_id
+        self.remove(chat_id)
+
+        # Leading space: " word" finds word starts
+        text = " " + " ".join(_words(f"{chat.title} {chat.username or ''}"))
+        self._texts[chat_id] = text
+
+        for word in set(text.split()):
+            for gram in _prefix_grams(word):
+                self._grams[gram].add(chat_id)
+
+    def remove(self, chat_id: int):
+        text = self._texts.pop(chat_id, None)
+
+        if text is None:
+            return
+
+        for word in set(text.split()):
+            for gram in _prefix_grams(word):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(chat_id)
+                    if not ids:
+                        del self._grams[gram]
+
+    # =====================
+    # SEARCH
+    # =====================
+
+    def _candidates(self, word: str) -> Set[int]:
+        grams = _prefix_grams(word)
+        if len(word) >= 3:
+            # Substring anywhere in a word: unpadded trigrams
+            grams = _inner_grams(word)
+
+        sets = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        if not sets:
+            return set()
+        return sets[0].intersection(*sets[1:])
+
+    def search(self, query: str, chat_type: Optional[str] = None, limit: int = 20) -> List[ChatRecord]:
+        """
+        Chats whose title or username contains every query word.
+        Title prefix matches first, then word prefixes, then the rest.
+        A numeric query also matches the chat id.
+        """
+        query = query.strip().lstrip("@")
+
+        try:
+            chat = self.chats.get(int(query))
+        except ValueError:
+            chat = None
+        if chat:
+            return [chat] if chat_type in (None, chat.chat_type) else []
+
+        words = _words(query)
+        if not words:
+            return []
+
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):
+            ids = self._candidates(word)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+
+        phrase = " " + " ".join(words)
+        starts = [" " + word for word in words]
+        # Padded trigrams of 1-2 letter words are exact prefix matches;
+        # longer words can over-match and are checked against the text
+        exact = all(len(word) < 3 for word in words)
+        matches = []
+
+        for chat_id in candidates:
+            chat = self.chats[chat_id]
+            if chat_type and chat.chat_type != chat_type:
+                continue
+
+            text = self._texts[chat_id]
+            if not exact and not all(word in text for word in words):
+                continue
+
+            if text.startswith(phrase):
+                rank = 0
+            elif exact or all(start in text for start in starts):
+                rank = 1
+            else:
+                rank = 2
+            matches.append((rank, text, chat))
+
+        best = heapq.nsmallest(limit, matches, key=lambda m: m[:2])
+        return [chat for _, _, chat in best]
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+import asyncpg
+
+from database.chat_index import ChatIndex, ChatRecord
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel of the chats table triggers (migration 6)
+CHATS_CHANNEL = "chats_changed"
+
+# Seconds between attempts to get the listener connection back
+RECONNECT_DELAY = 5
+
+
+class ChatRegistry:
+    """
+    All active chats in memory, grouped by type.
+
+    Broadcast targets and counts are read from here, without a query.
+    Database updates the registry in place on every chat change; the
+    chats table triggers NOTIFY the ids of changed rows, so changes made
+    by other processes are re-read within a round trip.
+
+    A "*" payload (too many ids for one notification) reloads everything.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+        self.chats: Dict[int, ChatRecord] = {}
+        self.by_type: Dict[str, Set[int]] = defaultdict(set)
+        self.index = ChatIndex(self.chats)
+
+        self._conn: Optional[asyncpg.Connection] = None
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._reconnect: Optional[asyncio.Task] = None
+
+    # =====================
+    # READS
+    # =====================
+
+    def ids(self, chat_type: Optional[str] = None) -> List[int]:
+        if chat_type is None:
+            return list(self.chats)
+        return list(self.by_type.get(chat_type, ()))
+
+    def count(self, chat_type: Optional[str] = None) -> int:
+        if chat_type is None:
+            return len(self.chats)
+        return len(self.by_type.get(chat_type, ()))
+
+    # =====================
+    # IN-PLACE UPDATES
+    # =====================
+
+    def put(self, chat: ChatRecord):
+        self.discard(chat.chat_id)
+
+        self.chats[chat.chat_id] = chat
+        self.by_type[chat.chat_type].add(chat.chat_id)
+        self.index.add(chat)
+
+    def discard(self, chat_id: int):
+        chat = self.chats.pop(chat_id, None)
+        if chat is None:
+            return
+
+        self.by_type[chat.chat_type].discard(chat_id)
+        self.index.remove(chat_id)
+
+    def discard_many(self, chat_ids: Iterable[int]):
+        for chat_id in chat_ids:
+            self.discard(chat_id)
+
+    def rename(self, old_id: int, new_id: int, chat_type: str = "supergroup"):
+        """Group upgraded to a supergroup: same chat, new id"""
+        chat = self.chats.get(old_id)
+        self.discard(old_id)
+
+        if chat and new_id not in self.chats:
+            self.put(ChatRecord(new_id, chat_type, chat.title, chat.username))
+
+    # =====================
+    # LOADING
+    # =====================
+
+    async def load(self):
+        """Rebuild the registry from active chats"""
+        rows = await self.pool.fetch("""
+            SELECT chat_id, chat_type, title, username
+            FROM chats
+            WHERE is_active
+        """)
+
+        self.chats.clear()
+        self.by_type.clear()
+        self.index.clear()
+
+        for row in rows:
+            self.put(ChatRecord(*row))
+
+    async def refresh(self, chat_ids: Iterable[int]):
+        """Re-read some chats: active ones are (re)added, the rest dropped"""
+        chat_ids = list(chat_ids)
+
+        rows = await self.pool.fetch("""
+            SELECT chat_id, chat_type, title, username
+            FROM chats
+            WHERE chat_id = ANY($1::BIGINT[]) AND is_active
+        """, chat_ids)
+
+        self.discard_many(chat_ids)
+        for row in rows:
+            self.put(ChatRecord(*row))
+
+    # =====================
+    # LISTEN / NOTIFY
+    # =====================
+
+    def _on_notify(self, conn, pid, channel, payload: str):
+        self._queue.put_nowait(payload)
+
+    def _on_lost(self, conn):
+        logger.warning("⚠️ Chat registry listener connection lost, reconnecting")
+        self._conn = None
+        self._reconnect = asyncio.create_task(self._relisten(conn))
+
+    async def _listen(self):
+        conn = await self.pool.acquire()
+        try:
+            await conn.add_listener(CHATS_CHANNEL, self._on_notify)
+        except Exception:
+            await self.pool.release(conn)
+            raise
+
+        conn.add_termination_listener(self._on_lost)
+        self._conn = conn
+
+        # Listening first: nothing committed after the load is missed
+        await self.load()
+
+    async def _relisten(self, lost: asyncpg.Connection):
+        await self.pool.release(lost)
+
+        while True:
+            try:
+                return await self._listen()
+            except Exception as e:
+                logger.error(f"❌ Chat registry listener: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _apply(self):
+        while True:
+            payloads = [await self._queue.get()]
+            while not self._queue.empty():
+                payloads.append(self._queue.get_nowait())
+
+            try:
+                if "*" in payloads:
+                    await self.load()
+                else:
+                    await self.refresh({
+                        int(chat_id)
+                        for payload in payloads
+                        for chat_id in payload.split(",")
+                    })
+            except Exception as e:
+                logger.error(f"❌ Chat registry update failed: {e}")
+
+    async def start(self):
+        """Load the registry and follow changes from other processes"""
+        await self._listen()
+        self._worker = asyncio.create_task(self._apply())
+
+    async def stop(self):
+        for task in (self._worker, self._reconnect):
+            if task:
+                task.cancel()
+
+        conn, self._conn = self._conn, None
+        if conn and not conn.is_closed():
+            conn.remove_termination_listener(self._on_lost)
+            await conn.remove_listener(CHATS_CHANNEL, self._on_notify)
+            await self.pool.release(conn)
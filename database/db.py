@@ -21,6 +21,8 @@ async def init_db() -> Database:
 
     db = Database(db_pool)
     await db.create_tables()
+    await db.roles.load()
+    await db.chat_registry.start()
     return db
 
 
@@ -30,4 +32,8 @@ async def close_db():
     """
     global db_pool
 
+    if db:
+        await db.chat_registry.stop()
+
     if db_pool:
+        await db_pool.close()
@@ -0,0 +1,105 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import asyncpg
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StateType, StorageKey
+
+import config
+
+
+class PostgresStorage(BaseStorage):
+    """
+    FSM storage in the fsm_storage table, so flows survive restarts
+    and can be shared by several bot processes.
+
+    Writes go straight to the database. Reads are served from a small
+    LRU cache whose entries live `cache_ttl` seconds, which bounds how
+    stale a state written by another process can be.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None
+    ):
+        self.pool = pool
+        self.cache_size = config.FSM_CACHE_SIZE if cache_size is None else cache_size
+        self.cache_ttl = config.FSM_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.key_builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+
+        # { key: (expires, state, data as JSON) }
+        self._cache: OrderedDict[str, Tuple[float, Optional[str], str]] = OrderedDict()
+
+    # =====================
+    # CACHE
+    # =====================
+
+    def _remember(self, key: str, state: Optional[str], data: str):
+        if not self.cache_size:
+            return
+
+        self._cache[key] = (time.monotonic() + self.cache_ttl, state, data)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _load(self, key: str) -> Tuple[Optional[str], str]:
+        entry = self._cache.get(key)
+
+        if entry and entry[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return entry[1], entry[2]
+
+        row = await self.pool.fetchrow(
+            "SELECT state, data::TEXT AS data FROM fsm_storage WHERE key = $1",
+            key
+        )
+        state, data = (row["state"], row["data"]) if row else (None, "{}")
+
+        self._remember(key, state, data)
+        return state, data
+
+    # =====================
+    # STORAGE API
+    # =====================
+
+    async def _write(self, key: str, column: str, value: str | None):
+        row = await self.pool.fetchrow(f"""
+            INSERT INTO fsm_storage (key, {column})
+            VALUES ($1, $2)
+            ON CONFLICT (key) DO UPDATE
+            SET {column} = EXCLUDED.{column}, updated_at = NOW()
+            RETURNING state, data::TEXT AS data
+        """, key, value)
+
+        # Finished flows leave no row behind
+        if row["state"] is None and row["data"] == "{}":
+            await self.pool.execute("""
+                DELETE FROM fsm_storage
+                WHERE key = $1 AND state IS NULL AND data = '{}'
+            """, key)
+
+        self._remember(key, row["state"], row["data"])
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        await self._write(self.key_builder.build(key), "state", state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        state, _ = await self._load(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._write(self.key_builder.build(key), "data", json.dumps(dict(data)))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data = await self._load(self.key_builder.build(key))
+        return json.loads(data)
+
+    async def close(self) -> None:
+        self._cache.clear()
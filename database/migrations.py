@@ -0,0 +1,440 @@
+import logging
+from typing import List, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Serializes migrations of processes starting at the same time
+MIGRATION_LOCK_ID = 726_413_001
+
+# (version, description, statements) — append only, never edit applied ones
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "initial schema", [
+        # Admins
+        """
+        CREATE TABLE IF NOT EXISTS admins (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT UNIQUE NOT NULL,
+            username TEXT,
+            full_name TEXT,
+            pin_code VARCHAR(4) NOT NULL,
+            added_date TIMESTAMP DEFAULT NOW()
+        )
+        """,
+
+        # Users
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            user_id BIGINT PRIMARY KEY,
+            username TEXT,
+            full_name TEXT,
+            first_seen TIMESTAMP DEFAULT NOW()
+        )
+        """,
+
+        # Chats
+        """
+        CREATE TABLE IF NOT EXISTS chats (
+            id SERIAL PRIMARY KEY,
+            chat_id BIGINT UNIQUE NOT NULL,
+            chat_type VARCHAR(50) NOT NULL,
+            title TEXT,
+            username TEXT,
+            invite_link TEXT,
+            description TEXT,
+            added_date TIMESTAMP DEFAULT NOW(),
+            is_active BOOLEAN DEFAULT TRUE
+        )
+        """,
+
+        # Broadcasts
+        """
+        CREATE TABLE IF NOT EXISTS broadcasts (
+            id SERIAL PRIMARY KEY,
+            admin_id BIGINT NOT NULL,
+            total_chats INTEGER DEFAULT 0,
+            success INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            broadcast_date TIMESTAMP DEFAULT NOW(),
+            message_type VARCHAR(50),
+            message_text TEXT
+        )
+        """,
+
+        # Super admins
+        """
+        CREATE TABLE IF NOT EXISTS super_admins (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT UNIQUE NOT NULL,
+            added_date TIMESTAMP DEFAULT NOW()
+        )
+        """,
+
+        # Broadcast jobs (durable, resumable broadcasts)
+        """
+        CREATE TABLE IF NOT EXISTS broadcast_jobs (
+            id SERIAL PRIMARY KEY,
+            admin_id BIGINT NOT NULL,
+            source_chat_id BIGINT NOT NULL,
+            source_message_id BIGINT NOT NULL,
+            album_message_ids BIGINT[],
+            send_mode VARCHAR(20) NOT NULL DEFAULT 'copy',
+            message_type VARCHAR(50),
+            message_text TEXT,
+            status VARCHAR(20) NOT NULL DEFAULT 'running',
+            total INTEGER DEFAULT 0,
+            success INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            created_date TIMESTAMP DEFAULT NOW(),
+            finished_date TIMESTAMP
+        )
+        """,
+
+        # Per-chat delivery state of a broadcast job
+        """
+        CREATE TABLE IF NOT EXISTS broadcast_deliveries (
+            job_id INTEGER NOT NULL
+                REFERENCES broadcast_jobs(id) ON DELETE CASCADE,
+            chat_id BIGINT NOT NULL,
+            -- pending → (claimed) → sending → sent / failed / unconfirmed
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            message_id INTEGER,
+            claimed_by TEXT,
+            claimed_at TIMESTAMP,
+            PRIMARY KEY (job_id, chat_id)
+        )
+        """,
+
+        # Scheduled / recurring broadcasts
+        """
+        CREATE TABLE IF NOT EXISTS broadcast_schedules (
+            id SERIAL PRIMARY KEY,
+            admin_id BIGINT NOT NULL,
+            source_chat_id BIGINT NOT NULL,
+            source_message_id BIGINT NOT NULL,
+            album_message_ids BIGINT[],
+            send_mode VARCHAR(20) NOT NULL DEFAULT 'copy',
+            message_type VARCHAR(50),
+            message_text TEXT,
+            target VARCHAR(20) NOT NULL,
+            chat_ids BIGINT[],
+            cron TEXT,
+            next_run TIMESTAMP NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_date TIMESTAMP DEFAULT NOW()
+        )
+        """
+    ]),
+
+    (2, "hot-path indexes", [
+        # get_chats_by_type, per-type counts
+        """
+        CREATE INDEX IF NOT EXISTS idx_chats_type_added
+        ON chats (chat_type, added_date DESC)
+        WHERE is_active
+        """,
+
+        # get_all_chats(only_active=True)
+        """
+        CREATE INDEX IF NOT EXISTS idx_chats_active_added
+        ON chats (added_date DESC)
+        WHERE is_active
+        """,
+
+        # get_all_users
+        """
+        CREATE INDEX IF NOT EXISTS idx_users_first_seen
+        ON users (first_seen DESC)
+        """,
+
+        # Broadcast history and date-range statistics
+        """
+        CREATE INDEX IF NOT EXISTS idx_broadcasts_date
+        ON broadcasts (broadcast_date)
+        """,
+
+        # claim_deliveries, get_pending_deliveries, finish / cancel job
+        """
+        CREATE INDEX IF NOT EXISTS idx_deliveries_open
+        ON broadcast_deliveries (job_id, chat_id)
+        WHERE status IN ('pending', 'claimed', 'sending')
+        """,
+
+        # release_stale_claims
+        """
+        CREATE INDEX IF NOT EXISTS idx_deliveries_in_flight
+        ON broadcast_deliveries (claimed_at)
+        WHERE status IN ('claimed', 'sending')
+        """,
+
+        # get_active_schedules
+        """
+        CREATE INDEX IF NOT EXISTS idx_schedules_next_run
+        ON broadcast_schedules (next_run)
+        WHERE is_active
+        """
+    ]),
+
+    (3, "statistics rollups", [
+        # No writes may slip in between the backfill and the triggers
+        "LOCK TABLE chats, broadcasts IN SHARE ROW EXCLUSIVE MODE",
+
+        # Per day, per admin broadcast totals
+        """
+        CREATE TABLE IF NOT EXISTS broadcast_daily_stats (
+            day DATE NOT NULL,
+            admin_id BIGINT NOT NULL,
+            broadcasts INTEGER NOT NULL DEFAULT 0,
+            success BIGINT NOT NULL DEFAULT 0,
+            failed BIGINT NOT NULL DEFAULT 0,
+            recipients BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, admin_id)
+        )
+        """,
+
+        # Active chats per type
+        """
+        CREATE TABLE IF NOT EXISTS chat_type_counts (
+            chat_type VARCHAR(50) PRIMARY KEY,
+            active BIGINT NOT NULL DEFAULT 0
+        )
+        """,
+
+        # Backfill from existing history
+        """
+        INSERT INTO broadcast_daily_stats (day, admin_id, broadcasts, success, failed, recipients)
+        SELECT broadcast_date::date, admin_id, COUNT(*),
+               COALESCE(SUM(success), 0), COALESCE(SUM(failed), 0), COALESCE(SUM(total_chats), 0)
+        FROM broadcasts
+        GROUP BY 1, 2
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO chat_type_counts (chat_type, active)
+        SELECT chat_type, COUNT(*) FROM chats WHERE is_active GROUP BY chat_type
+        ON CONFLICT DO NOTHING
+        """,
+
+        # Statement-level triggers keep the rollups current on every write
+        # path (single rows, bulk deactivation, migrations, finished jobs)
+        """
+        CREATE OR REPLACE FUNCTION rollup_broadcasts() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO broadcast_daily_stats AS s
+                (day, admin_id, broadcasts, success, failed, recipients)
+            SELECT broadcast_date::date, admin_id, COUNT(*),
+                   COALESCE(SUM(success), 0), COALESCE(SUM(failed), 0),
+                   COALESCE(SUM(total_chats), 0)
+            FROM new_rows
+            GROUP BY 1, 2
+            ON CONFLICT (day, admin_id) DO UPDATE SET
+                broadcasts = s.broadcasts + EXCLUDED.broadcasts,
+                success = s.success + EXCLUDED.success,
+                failed = s.failed + EXCLUDED.failed,
+                recipients = s.recipients + EXCLUDED.recipients;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE FUNCTION rollup_chats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE chat_type_counts c
+                SET active = c.active - o.n
+                FROM (
+                    SELECT chat_type, COUNT(*) AS n
+                    FROM old_rows WHERE is_active
+                    GROUP BY chat_type
+                ) o
+                WHERE c.chat_type = o.chat_type;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO chat_type_counts AS c (chat_type, active)
+                SELECT chat_type, COUNT(*)
+                FROM new_rows WHERE is_active
+                GROUP BY chat_type
+                ON CONFLICT (chat_type) DO UPDATE SET
+                    active = c.active + EXCLUDED.active;
+            END IF;
+
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER broadcasts_rollup
+        AFTER INSERT ON broadcasts
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_broadcasts()
+        """,
+        """
+        CREATE TRIGGER chats_rollup_insert
+        AFTER INSERT ON chats
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_chats()
+        """,
+        """
+        CREATE TRIGGER chats_rollup_update
+        AFTER UPDATE ON chats
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_chats()
+        """,
+        """
+        CREATE TRIGGER chats_rollup_delete
+        AFTER DELETE ON chats
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_chats()
+        """
+    ]),
+
+    (4, "keyset pagination indexes", [
+        # page_users: (first_seen, user_id) keyset
+        "DROP INDEX IF EXISTS idx_users_first_seen",
+        """
+        CREATE INDEX IF NOT EXISTS idx_users_first_seen_id
+        ON users (first_seen DESC, user_id DESC)
+        """,
+
+        # page_chats: (added_date, id) keyset, per type and for all chats
+        "DROP INDEX IF EXISTS idx_chats_type_added",
+        """
+        CREATE INDEX IF NOT EXISTS idx_chats_type_added_id
+        ON chats (chat_type, added_date DESC, id DESC)
+        WHERE is_active
+        """,
+        "DROP INDEX IF EXISTS idx_chats_active_added",
+        """
+        CREATE INDEX IF NOT EXISTS idx_chats_active_added_id
+        ON chats (added_date DESC, id DESC)
+        WHERE is_active
+        """
+    ]),
+    (5, "fsm storage", [
+        # One row per FSM key (bot, chat, user, destiny), see database/fsm_storage.py
+        """
+        CREATE TABLE IF NOT EXISTS fsm_storage (
+            key TEXT PRIMARY KEY,
+            state TEXT,
+            data JSONB NOT NULL DEFAULT '{}',
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+        """
+    ]),
+    (6, "chat change notifications", [
+        # Ids of changed chats for every process's ChatRegistry,
+        # "*" when they would not fit one payload (8000 bytes)
+        """
+        CREATE OR REPLACE FUNCTION notify_chats() RETURNS trigger AS $$
+        DECLARE
+            ids BIGINT[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT ARRAY_AGG(chat_id) INTO ids FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT ARRAY_AGG(chat_id) INTO ids FROM old_rows;
+            ELSE
+                SELECT ARRAY_AGG(chat_id) INTO ids FROM (
+                    SELECT chat_id FROM old_rows
+                    UNION
+                    SELECT chat_id FROM new_rows
+                ) r;
+            END IF;
+
+            IF ids IS NOT NULL THEN
+                PERFORM pg_notify('chats_changed', CASE
+                    WHEN CARDINALITY(ids) > 400 THEN '*'
+                    ELSE ARRAY_TO_STRING(ids, ',')
+                END);
+            END IF;
+
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER chats_notify_insert
+        AFTER INSERT ON chats
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_chats()
+        """,
+        """
+        CREATE TRIGGER chats_notify_update
+        AFTER UPDATE ON chats
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_chats()
+        """,
+        """
+        CREATE TRIGGER chats_notify_delete
+        AFTER DELETE ON chats
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_chats()
+        """
+    ]),
+    (7, "job delivery mode", [
+        # 'local': delivered by the bot process that created it,
+        # 'external': claimed by sender_worker.py processes
+        """
+        ALTER TABLE broadcast_jobs
+        ADD COLUMN IF NOT EXISTS delivery_mode VARCHAR(20) NOT NULL DEFAULT 'local'
+        """
+    ]),
+    (8, "delivered message ids", [
+        # Every message id of a delivery (several for albums), as returned
+        # by Telegram; message_id keeps the first one
+        """
+        ALTER TABLE broadcast_deliveries
+        ADD COLUMN IF NOT EXISTS message_ids BIGINT[]
+        """
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+async def get_schema_version(conn: asyncpg.Connection) -> int:
+    try:
+        return await conn.fetchval("SELECT MAX(version) FROM schema_version") or 0
+    except asyncpg.UndefinedTableError:
+        return 0
+
+
+async def run_migrations(pool: asyncpg.Pool) -> int:
+    """
+    Bring the schema up to date. Returns the schema version.
+    When the schema is current this is a single SELECT, no DDL.
+    """
+    async with pool.acquire() as conn:
+        if await get_schema_version(conn) >= LATEST_VERSION:
+            return LATEST_VERSION
+
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", MIGRATION_LOCK_ID)
+
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_date TIMESTAMP DEFAULT NOW()
+                )
+            """)
+
+            # Another process may have migrated while we waited for the lock
+            current = await get_schema_version(conn)
+
+            for version, description, statements in MIGRATIONS:
+                if version <= current:
+                    continue
+
+                for statement in statements:
+                    await conn.execute(statement)
+
+                await conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES ($1, $2)",
+                    version, description
+                )
+                logger.info(f"🗄 Applied migration {version}: {description}")
+
+    return LATEST_VERSION
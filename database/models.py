@@ -1,5 +1,32 @@
 import asyncpg
-from typing import List, Dict, Optional
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+import config
+
+from database.migrations import run_migrations
+from database.roles import RoleCache
+from database.chat_index import ChatRecord
+from database.chat_registry import ChatRegistry
+from database.rows import AdminRow, BroadcastRow, ChatRow, UserRow
+
+# Active chat counts from the chat_type_counts rollup
+CHAT_TYPE_COUNTS = """
+    COALESCE(SUM(active) FILTER (WHERE chat_type = 'channel'), 0)::BIGINT AS channels,
+    COALESCE(SUM(active) FILTER (WHERE chat_type = 'group'), 0)::BIGINT AS groups,
+    COALESCE(SUM(active) FILTER (WHERE chat_type = 'supergroup'), 0)::BIGINT AS supergroups,
+    COALESCE(SUM(active), 0)::BIGINT AS total
+"""
+
+# Broadcast counts per period from the broadcast_daily_stats rollup
+BROADCAST_PERIOD_COUNTS = """
+    COALESCE(SUM(broadcasts) FILTER (WHERE day = CURRENT_DATE), 0)::BIGINT AS today,
+    COALESCE(SUM(broadcasts) FILTER (WHERE day >= CURRENT_DATE - 7), 0)::BIGINT AS week,
+    COALESCE(SUM(broadcasts) FILTER (
+        WHERE day >= DATE_TRUNC('month', CURRENT_DATE)
+    ), 0)::BIGINT AS month
+"""
 
 
 class Database:
@@ -10,18 +37,24 @@ class Database:
 
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
+        # Admin / super admin ids, checked on every admin message
+        self.roles = RoleCache(pool)
+        # Active chats by type, for targets, counts, search and inline mode
+        self.chat_registry = ChatRegistry(pool)
+        # (count, expiry) of count_users
+        self._user_count = (0, 0.0)
 
     # =====================================================
     # UNIVERSAL QUERY HELPERS
     # =====================================================
 
-    async def fetch(self, query: str, *args):
+    async def fetch(self, query: str, *args, record_class=None):
         async with self.pool.acquire() as conn:
-            return await conn.fetch(query, *args)
+            return await conn.fetch(query, *args, record_class=record_class)
 
-    async def fetchrow(self, query: str, *args):
+    async def fetchrow(self, query: str, *args, record_class=None):
         async with self.pool.acquire() as conn:
-            return await conn.fetchrow(query, *args)
+            return await conn.fetchrow(query, *args, record_class=record_class)
 
     async def fetchval(self, query: str, *args):
         async with self.pool.acquire() as conn:
@@ -36,104 +69,96 @@ class Database:
     # =====================================================
 
     async def create_tables(self):
-        """Create all required tables if they do not exist"""
-        async with self.pool.acquire() as conn:
-
-            # Admins
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS admins (
-                    id SERIAL PRIMARY KEY,
-                    user_id BIGINT UNIQUE NOT NULL,
-                    username TEXT,
-                    full_name TEXT,
-                    pin_code VARCHAR(4) NOT NULL,
-                    added_date TIMESTAMP DEFAULT NOW()
-                )
-            """)
-
-            # Users
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id BIGINT PRIMARY KEY,
-                    username TEXT,
-                    full_name TEXT,
-                    first_seen TIMESTAMP DEFAULT NOW()
-                )
-            """)
-
-            # Chats
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS chats (
-                    id SERIAL PRIMARY KEY,
-                    chat_id BIGINT UNIQUE NOT NULL,
-                    chat_type VARCHAR(50) NOT NULL,
-                    title TEXT,
-                    username TEXT,
-                    invite_link TEXT,
-                    description TEXT,
-                    added_date TIMESTAMP DEFAULT NOW(),
-                    is_active BOOLEAN DEFAULT TRUE
-                )
-            """)
-
-            # Broadcasts
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS broadcasts (
-                    id SERIAL PRIMARY KEY,
-                    admin_id BIGINT NOT NULL,
-                    total_chats INTEGER DEFAULT 0,
-                    success INTEGER DEFAULT 0,
-                    failed INTEGER DEFAULT 0,
-                    broadcast_date TIMESTAMP DEFAULT NOW(),
-                    message_type VARCHAR(50),
-                    message_text TEXT
-                )
-            """)
-
-            # Super admins
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS super_admins (
-                    id SERIAL PRIMARY KEY,
-                    user_id BIGINT UNIQUE NOT NULL,
-                    added_date TIMESTAMP DEFAULT NOW()
-                )
-            """)
+        """Apply pending schema migrations (see database/migrations.py)"""
+        return await run_migrations(self.pool)
 
     # =====================================================
     # USER METHODS
     # =====================================================
 
-    async def get_all_users(self) -> List[Dict]:
+    async def get_all_users(self) -> List[UserRow]:
         """Return all users ordered by first_seen DESC"""
-        rows = await self.fetch("""
+        return await self.fetch("""
             SELECT * FROM users
             ORDER BY first_seen DESC
-        """)
-        return [dict(r) for r in rows]
+        """, record_class=UserRow)
+
+    async def count_users(self) -> int:
+        """Number of users, recounted at most every USER_COUNT_TTL seconds"""
+        count, expires = self._user_count
+        if time.monotonic() >= expires:
+            count = await self.fetchval("SELECT COUNT(*) FROM users")
+            self._user_count = (count, time.monotonic() + config.USER_COUNT_TTL)
+        return count
+
+    async def page_users(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 20
+    ) -> List[UserRow]:
+        """
+        One page of users, newest first, by keyset on (first_seen, user_id).
+        `after` / `before` are the keys of the last / first row of the
+        neighbouring page.
+        """
+        if before:
+            rows = await self.fetch("""
+                SELECT * FROM users
+                WHERE (first_seen, user_id) > ($1, $2)
+                ORDER BY first_seen, user_id
+                LIMIT $3
+            """, *before, limit, record_class=UserRow)
+            return rows[::-1]
+
+        if after:
+            return await self.fetch("""
+                SELECT * FROM users
+                WHERE (first_seen, user_id) < ($1, $2)
+                ORDER BY first_seen DESC, user_id DESC
+                LIMIT $3
+            """, *after, limit, record_class=UserRow)
+
+        return await self.fetch("""
+            SELECT * FROM users
+            ORDER BY first_seen DESC, user_id DESC
+            LIMIT $1
+        """, limit, record_class=UserRow)
 
     async def add_user(self, user_id: int, username: str, full_name: str) -> bool:
         """
         Add new user or update existing one.
         Returns True if user is new, False otherwise.
         """
-        exists = await self.fetchval(
-            "SELECT 1 FROM users WHERE user_id = $1", user_id
-        )
-
-        if exists:
-            await self.execute("""
-                UPDATE users
-                SET username = $2, full_name = $3
-                WHERE user_id = $1
-            """, user_id, username, full_name)
-            return False
-
-        await self.execute("""
+        # xmax is 0 only for a freshly inserted row version
+        return await self.fetchval("""
             INSERT INTO users (user_id, username, full_name)
             VALUES ($1, $2, $3)
+            ON CONFLICT (user_id)
+            DO UPDATE SET username = EXCLUDED.username,
+                          full_name = EXCLUDED.full_name
+            RETURNING (xmax = 0)
         """, user_id, username, full_name)
 
-        return True
+    async def add_users(
+        self,
+        user_ids: List[int],
+        usernames: List[Optional[str]],
+        full_names: List[Optional[str]]
+    ) -> List[int]:
+        """
+        Add or update a batch of users in one statement.
+        `user_ids` must be unique. Returns the ids of new users.
+        """
+        rows = await self.fetch("""
+            INSERT INTO users (user_id, username, full_name)
+            SELECT * FROM UNNEST($1::BIGINT[], $2::TEXT[], $3::TEXT[])
+            ON CONFLICT (user_id)
+            DO UPDATE SET username = EXCLUDED.username,
+                          full_name = EXCLUDED.full_name
+            RETURNING user_id, (xmax = 0) AS is_new
+        """, user_ids, usernames, full_names)
+        return [r["user_id"] for r in rows if r["is_new"]]
 
     # =====================================================
     # ADMIN METHODS
@@ -158,25 +183,23 @@ class Database:
             ON CONFLICT (user_id)
             DO UPDATE SET pin_code = $4
         """, user_id, username, full_name, pin_code)
+        self.roles.set_admin(user_id)
 
         return pin_code
 
     async def is_admin(self, user_id: int) -> bool:
-        return bool(await self.fetchval(
-            "SELECT 1 FROM admins WHERE user_id = $1",
-            user_id
-        ))
+        return user_id in (await self.roles.fresh()).admins
 
     async def remove_admin(self, user_id: int) -> bool:
         await self.execute("DELETE FROM admins WHERE user_id = $1", user_id)
+        self.roles.set_admin(user_id, False)
         return True
 
-    async def get_all_admins(self) -> List[Dict]:
-        rows = await self.fetch("""
+    async def get_all_admins(self) -> List[AdminRow]:
+        return await self.fetch("""
             SELECT * FROM admins
             ORDER BY added_date DESC
-        """)
-        return [dict(r) for r in rows]
+        """, record_class=AdminRow)
 
     # =====================================================
     # SUPER ADMIN METHODS
@@ -188,27 +211,25 @@ class Database:
             VALUES ($1)
             ON CONFLICT (user_id) DO NOTHING
         """, user_id)
+        self.roles.set_super_admin(user_id)
 
     async def remove_super_admin(self, user_id: int):
         await self.execute(
             "DELETE FROM super_admins WHERE user_id = $1",
             user_id
         )
+        self.roles.set_super_admin(user_id, False)
 
     async def is_super_admin(self, user_id: int) -> bool:
-        return bool(await self.fetchval(
-            "SELECT 1 FROM super_admins WHERE user_id = $1",
-            user_id
-        ))
+        return user_id in (await self.roles.fresh()).super_admins
 
-    async def get_all_super_admins(self) -> List[Dict]:
-        rows = await self.fetch("""
+    async def get_all_super_admins(self) -> List[AdminRow]:
+        return await self.fetch("""
             SELECT sa.user_id, a.username, a.full_name, sa.added_date
             FROM super_admins sa
             LEFT JOIN admins a ON sa.user_id = a.user_id
             ORDER BY sa.added_date DESC
-        """)
-        return [dict(r) for r in rows]
+        """, record_class=AdminRow)
 
     # =====================================================
     # PIN MANAGEMENT
@@ -262,6 +283,7 @@ class Database:
                 description = EXCLUDED.description,
                 is_active = TRUE
         """, chat_id, chat_type, title, username, invite_link, description)
+        self.chat_registry.put(ChatRecord(chat_id, chat_type, title, username))
 
         return True
 
@@ -271,55 +293,134 @@ class Database:
                 "DELETE FROM chats WHERE chat_id = $1",
                 chat_id
             )
+            self.chat_registry.discard(chat_id)
             return True
         except Exception as e:
             return False
 
-    async def get_chat_by_id(self, chat_id: int) -> Optional[Dict]:
-        row = await self.fetchrow(
+    async def deactivate_chats(self, chat_ids: List[int]) -> str:
+        """Mark many chats as inactive in one statement"""
+        result = await self.execute("""
+            UPDATE chats
+            SET is_active = FALSE
+            WHERE chat_id = ANY($1::BIGINT[])
+        """, chat_ids)
+        self.chat_registry.discard_many(chat_ids)
+        return result
+
+    async def migrate_chats(self, old_ids: List[int], new_ids: List[int]):
+        """
+        Rewrite chat ids of groups upgraded to supergroups.
+        If the supergroup is already stored, the old group row is dropped.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    DELETE FROM chats c
+                    USING UNNEST($1::BIGINT[], $2::BIGINT[]) AS m(old_id, new_id)
+                    WHERE c.chat_id = m.old_id
+                      AND EXISTS (
+                          SELECT 1 FROM chats n WHERE n.chat_id = m.new_id
+                      )
+                """, old_ids, new_ids)
+
+                await conn.execute("""
+                    UPDATE chats c
+                    SET chat_id = m.new_id, chat_type = 'supergroup'
+                    FROM UNNEST($1::BIGINT[], $2::BIGINT[]) AS m(old_id, new_id)
+                    WHERE c.chat_id = m.old_id
+                """, old_ids, new_ids)
+
+        for old_id, new_id in zip(old_ids, new_ids):
+            self.chat_registry.rename(old_id, new_id)
+
+    def search_chats(
+        self,
+        query: str,
+        chat_type: Optional[str] = None,
+        limit: int = 20
+    ) -> List[ChatRecord]:
+        """Search active chats by title, username or id (in memory)"""
+        return self.chat_registry.index.search(query, chat_type, limit)
+
+    async def get_chat_by_id(self, chat_id: int) -> Optional[ChatRow]:
+        return await self.fetchrow(
             "SELECT * FROM chats WHERE chat_id = $1",
-            chat_id
+            chat_id,
+            record_class=ChatRow
         )
-        return dict(row) if row else None
 
-    async def get_all_chats(self, only_active: bool = True) -> List[Dict]:
+    async def get_all_chats(self, only_active: bool = True) -> List[ChatRow]:
         if only_active:
-            rows = await self.fetch("""
+            return await self.fetch("""
                 SELECT * FROM chats
                 WHERE is_active = TRUE
                 ORDER BY added_date DESC
-            """)
-        else:
-            rows = await self.fetch("""
-                SELECT * FROM chats
-                ORDER BY added_date DESC
-            """)
+            """, record_class=ChatRow)
 
-        return [dict(r) for r in rows]
+        return await self.fetch("""
+            SELECT * FROM chats
+            ORDER BY added_date DESC
+        """, record_class=ChatRow)
 
-    async def get_chats_by_type(self, chat_type: str) -> List[Dict]:
-        rows = await self.fetch("""
+    async def page_chats(
+        self,
+        chat_type: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 20
+    ) -> List[ChatRow]:
+        """
+        One page of active chats (optionally of one type), newest first,
+        by keyset on (added_date, id). See page_users for `after` / `before`.
+        """
+        key = before or after
+        conditions = ["is_active"]
+        args = []
+
+        if chat_type:
+            args.append(chat_type)
+            conditions.append(f"chat_type = ${len(args)}")
+
+        if key:
+            args.extend(key)
+            op = ">" if before else "<"
+            conditions.append(f"(added_date, id) {op} (${len(args) - 1}, ${len(args)})")
+
+        order = "" if before else " DESC"
+        args.append(limit)
+
+        rows = await self.fetch(f"""
+            SELECT * FROM chats
+            WHERE {" AND ".join(conditions)}
+            ORDER BY added_date{order}, id{order}
+            LIMIT ${len(args)}
+        """, *args, record_class=ChatRow)
+
+        return rows[::-1] if before else rows
+
+    async def get_chats_by_type(self, chat_type: str) -> List[ChatRow]:
+        return await self.fetch("""
             SELECT * FROM chats
             WHERE chat_type = $1 AND is_active = TRUE
             ORDER BY added_date DESC
-        """, chat_type)
-        return [dict(r) for r in rows]
+        """, chat_type, record_class=ChatRow)
+
+    def get_active_chat_ids(self, chat_type: Optional[str] = None) -> List[int]:
+        """Ids of active chats (of one type or all), from memory"""
+        return self.chat_registry.ids(chat_type)
+
+    def count_active_chats(self, chat_type: Optional[str] = None) -> int:
+        """Number of active chats (of one type or all), from memory"""
+        return self.chat_registry.count(chat_type)
 
     async def get_chat_type_counts(self) -> Dict[str, int]:
-        return {
-            "channels": await self.fetchval(
-                "SELECT COUNT(*) FROM chats WHERE chat_type = 'channel' AND is_active = TRUE"
-            ) or 0,
-            "groups": await self.fetchval(
-                "SELECT COUNT(*) FROM chats WHERE chat_type = 'group' AND is_active = TRUE"
-            ) or 0,
-            "supergroups": await self.fetchval(
-                "SELECT COUNT(*) FROM chats WHERE chat_type = 'supergroup' AND is_active = TRUE"
-            ) or 0,
-            "total": await self.fetchval(
-                "SELECT COUNT(*) FROM chats WHERE is_active = TRUE"
-            ) or 0
-        }
+        """Active chats per type, read from the chat_type_counts rollup"""
+        row = await self.fetchrow(f"""
+            SELECT {CHAT_TYPE_COUNTS}
+            FROM chat_type_counts
+        """)
+        return dict(row)
 
     # =====================================================
     # BROADCAST METHODS
@@ -342,65 +443,468 @@ class Database:
             VALUES ($1, $2, $3, $4, $5, $6)
         """, admin_id, total, success, failed, message_type, message_text)
 
-    async def get_broadcast_stats(self, limit: int = 10) -> List[Dict]:
-        rows = await self.fetch("""
+    async def get_broadcast_stats(self, limit: int = 10) -> List[BroadcastRow]:
+        return await self.fetch("""
             SELECT b.*, a.username AS admin_username
             FROM broadcasts b
             LEFT JOIN admins a ON b.admin_id = a.user_id
             ORDER BY broadcast_date DESC
             LIMIT $1
-        """, limit)
-        return [dict(r) for r in rows]
+        """, limit, record_class=BroadcastRow)
 
     async def get_total_broadcast_stats(self) -> Dict:
         row = await self.fetchrow("""
             SELECT
-                COUNT(*) AS total_broadcasts,
-                SUM(success) AS total_success,
-                SUM(failed) AS total_failed
-            FROM broadcasts
+                COALESCE(SUM(broadcasts), 0)::BIGINT AS total_broadcasts,
+                COALESCE(SUM(success), 0)::BIGINT AS total_success,
+                COALESCE(SUM(failed), 0)::BIGINT AS total_failed
+            FROM broadcast_daily_stats
         """)
-
-        return dict(row) if row else {
-            "total_broadcasts": 0,
-            "total_success": 0,
-            "total_failed": 0
-        }
+        return dict(row)
 
     async def get_time_based_broadcast_stats(self) -> Dict[str, int]:
-        today = await self.fetchval("""
-            SELECT COUNT(*)
-            FROM broadcasts
-            WHERE DATE(broadcast_date) = CURRENT_DATE
+        """Broadcast counts for today / last 7 days / this month / all time"""
+        row = await self.fetchrow(f"""
+            SELECT {BROADCAST_PERIOD_COUNTS},
+                COALESCE(SUM(broadcasts), 0)::BIGINT AS total
+            FROM broadcast_daily_stats
         """)
+        return dict(row)
 
-        week = await self.fetchval("""
-            SELECT COUNT(*)
-            FROM broadcasts
-            WHERE broadcast_date >= CURRENT_DATE - INTERVAL '7 days'
-        """)
+    async def get_today_broadcast_admins(self) -> List[AdminRow]:
+        return await self.fetch("""
+            SELECT a.full_name, a.username, a.user_id
+            FROM broadcast_daily_stats s
+            JOIN admins a ON a.user_id = s.admin_id
+            WHERE s.day = CURRENT_DATE
+        """, record_class=AdminRow)
+
+    async def get_statistics(self, days: int = 7) -> Dict:
+        """
+        Everything the statistics screen shows except the admin list,
+        in one round trip. Reads only the rollup tables, so the cost
+        does not grow with broadcast history.
+        `daily` holds broadcast counts of the last `days` days, oldest
+        first, and `daily_days` their dates (the database's, not ours).
+        """
+        row = await self.fetchrow(f"""
+            WITH chat_counts AS (
+                SELECT {CHAT_TYPE_COUNTS}
+                FROM chat_type_counts
+            ),
+            broadcast_counts AS (
+                SELECT {BROADCAST_PERIOD_COUNTS},
+                    COALESCE(SUM(broadcasts), 0)::BIGINT AS total_broadcasts,
+                    COALESCE(SUM(success), 0)::BIGINT AS total_success,
+                    COALESCE(SUM(failed), 0)::BIGINT AS total_failed
+                FROM broadcast_daily_stats
+            ),
+            daily AS (
+                SELECT
+                    ARRAY_AGG(d.day::date ORDER BY d.day) AS days,
+                    ARRAY_AGG(COALESCE(s.broadcasts, 0)::BIGINT ORDER BY d.day) AS counts
+                FROM generate_series(CURRENT_DATE - ($1 - 1), CURRENT_DATE, INTERVAL '1 day') d(day)
+                LEFT JOIN (
+                    SELECT day, SUM(broadcasts) AS broadcasts
+                    FROM broadcast_daily_stats
+                    GROUP BY day
+                ) s ON s.day = d.day::date
+            )
+            SELECT
+                chat_counts.channels,
+                chat_counts.groups,
+                chat_counts.supergroups,
+                chat_counts.total AS total_chats,
+                broadcast_counts.*,
+                (SELECT COUNT(*) FROM admins) AS admins,
+                daily.days AS daily_days,
+                daily.counts AS daily
+            FROM chat_counts, broadcast_counts, daily
+        """, days)
+        return dict(row)
 
-        month = await self.fetchval("""
-            SELECT COUNT(*)
-            FROM broadcasts
-            WHERE DATE_TRUNC('month', broadcast_date)
-                  = DATE_TRUNC('month', CURRENT_DATE)
+    # =====================================================
+    # BROADCAST JOB METHODS
+    # =====================================================
+
+    async def create_broadcast_job(
+        self,
+        admin_id: int,
+        source_chat_id: int,
+        source_message_id: int,
+        send_mode: str,
+        chat_ids: List[int],
+        message_type: Optional[str] = None,
+        message_text: Optional[str] = None,
+        album_message_ids: Optional[List[int]] = None,
+        status: str = "running",
+        delivery_mode: str = "local"
+    ) -> int:
+        """
+        Create a broadcast job with one pending delivery per chat.
+        Jobs created as 'scheduled' are not delivered until started.
+        Only 'external' jobs are claimed by sender workers; 'local'
+        ones are delivered by the bot process.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                job_id = await conn.fetchval("""
+                    INSERT INTO broadcast_jobs (
+                        admin_id, source_chat_id, source_message_id,
+                        send_mode, message_type, message_text, total,
+                        album_message_ids, status, delivery_mode
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    RETURNING id
+                """, admin_id, source_chat_id, source_message_id,
+                    send_mode, message_type, message_text, len(chat_ids),
+                    album_message_ids, status, delivery_mode)
+
+                await conn.execute("""
+                    INSERT INTO broadcast_deliveries (job_id, chat_id)
+                    SELECT $1, UNNEST($2::BIGINT[])
+                    ON CONFLICT DO NOTHING
+                """, job_id, chat_ids)
+
+        return job_id
+
+    async def get_broadcast_job(self, job_id: int) -> Optional[Dict]:
+        row = await self.fetchrow(
+            "SELECT * FROM broadcast_jobs WHERE id = $1",
+            job_id
+        )
+        return dict(row) if row else None
+
+    async def start_scheduled_job(self, job_id: int):
+        await self.execute("""
+            UPDATE broadcast_jobs
+            SET status = 'running'
+            WHERE id = $1 AND status = 'scheduled'
+        """, job_id)
+
+    async def get_unfinished_broadcast_jobs(self) -> List[Dict]:
+        """
+        Interrupted (running or paused) jobs of the bot process;
+        sender workers own the rest.
+        """
+        rows = await self.fetch("""
+            SELECT * FROM broadcast_jobs
+            WHERE status IN ('running', 'paused') AND delivery_mode = 'local'
+            ORDER BY created_date
         """)
+        return [dict(r) for r in rows]
 
-        total = await self.fetchval("SELECT COUNT(*) FROM broadcasts")
+    async def get_pending_deliveries(self, job_id: int) -> List[int]:
+        rows = await self.fetch("""
+            SELECT chat_id FROM broadcast_deliveries
+            WHERE job_id = $1 AND status = 'pending'
+            ORDER BY chat_id
+        """, job_id)
+        return [r["chat_id"] for r in rows]
 
-        return {
-            "today": today or 0,
-            "week": week or 0,
-            "month": month or 0,
-            "total": total or 0
-        }
+    async def begin_deliveries(
+        self,
+        job_id: int,
+        chat_ids: List[int],
+        owner: str
+    ) -> List[int]:
+        """
+        Record the intent to send before the API call, tagged with the
+        sending process. (job_id, chat_id) is the idempotency key of a
+        delivery: only pending or claimed rows move to 'sending', so
+        chats that are already confirmed or in flight elsewhere are not
+        returned.
+        """
+        rows = await self.fetch("""
+            UPDATE broadcast_deliveries
+            SET status = 'sending', claimed_by = $3, claimed_at = NOW()
+            WHERE job_id = $1
+              AND chat_id = ANY($2::BIGINT[])
+              AND status IN ('pending', 'claimed')
+            RETURNING chat_id
+        """, job_id, chat_ids, owner)
+        return [r["chat_id"] for r in rows]
+
+    async def release_deliveries(self, job_id: int, chat_ids: List[int]):
+        """Intents that were never sent (run cancelled): back to 'pending'"""
+        await self.execute("""
+            UPDATE broadcast_deliveries
+            SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+            WHERE job_id = $1
+              AND chat_id = ANY($2::BIGINT[])
+              AND status = 'sending'
+        """, job_id, chat_ids)
+
+    async def touch_deliveries(self, job_id: int, chat_ids: List[int]):
+        """Heartbeat of in-flight deliveries: they still have a live owner"""
+        await self.execute("""
+            UPDATE broadcast_deliveries
+            SET claimed_at = NOW()
+            WHERE job_id = $1
+              AND chat_id = ANY($2::BIGINT[])
+              AND status = 'sending'
+        """, job_id, chat_ids)
+
+    async def mark_unconfirmed(self, job_id: int, owner: str) -> str:
+        """
+        Deliveries left 'sending' by a crash may or may not have been
+        sent. They are never sent again. Local jobs are only sent by the
+        bot process, so every row not owned by `owner` (the running
+        process) is left over from a previous run.
+        """
+        return await self.execute("""
+            UPDATE broadcast_deliveries
+            SET status = 'unconfirmed'
+            WHERE job_id = $1
+              AND status = 'sending'
+              AND claimed_by IS DISTINCT FROM $2
+        """, job_id, owner)
+
+    async def save_delivery_results(
+        self,
+        job_id: int,
+        chat_ids: List[int],
+        statuses: List[str],
+        message_ids: List[Optional[List[int]]]
+    ):
+        """
+        Checkpoint a batch of delivery results in one transaction.
+        `message_ids` holds the ids of the delivered messages in each
+        chat (several for an album), exactly as Telegram returned them.
+        """
+        # Array literals: a list of lists of different lengths can't be
+        # passed as one BIGINT[][] parameter
+        message_ids = [
+            "{" + ",".join(map(str, ids)) + "}" if ids else None
+            for ids in message_ids
+        ]
 
-    async def get_today_broadcast_admins(self) -> List[Dict]:
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # Only in-flight deliveries are confirmed,
+                # so a replayed batch is never counted twice
+                rows = await conn.fetch("""
+                    UPDATE broadcast_deliveries d
+                    SET status = v.status,
+                        message_ids = v.message_ids::BIGINT[],
+                        message_id = (v.message_ids::BIGINT[])[1]
+                    FROM UNNEST($2::BIGINT[], $3::TEXT[], $4::TEXT[])
+                        AS v(chat_id, status, message_ids)
+                    WHERE d.job_id = $1
+                      AND d.chat_id = v.chat_id
+                      AND d.status = 'sending'
+                    RETURNING d.status
+                """, job_id, chat_ids, statuses, message_ids)
+
+                success = sum(1 for r in rows if r["status"] == "sent")
+                failed = len(rows) - success
+
+                await conn.execute("""
+                    UPDATE broadcast_jobs
+                    SET success = success + $2, failed = failed + $3
+                    WHERE id = $1
+                """, job_id, success, failed)
+
+    async def get_delivered_messages(self, job_id: int) -> List[Dict]:
+        """
+        (chat_id, message_id, message_ids) of every delivery of a job.
+        Rows saved before message_ids existed only know their first id.
+        """
         rows = await self.fetch("""
-            SELECT DISTINCT a.full_name, a.username, a.user_id
-            FROM broadcasts b
-            JOIN admins a ON b.admin_id = a.user_id
-            WHERE DATE(b.broadcast_date) = CURRENT_DATE
+            SELECT
+                chat_id, message_id,
+                COALESCE(message_ids, ARRAY[message_id]::BIGINT[]) AS message_ids
+            FROM broadcast_deliveries
+            WHERE job_id = $1
+              AND status = 'sent'
+              AND message_id IS NOT NULL
+        """, job_id)
+        return [dict(r) for r in rows]
+
+    async def mark_deliveries(self, job_id: int, chat_ids: List[int], status: str):
+        await self.execute("""
+            UPDATE broadcast_deliveries
+            SET status = $3
+            WHERE job_id = $1 AND chat_id = ANY($2::BIGINT[])
+        """, job_id, chat_ids, status)
+
+    async def set_broadcast_job_text(self, job_id: int, text: str):
+        await self.execute(
+            "UPDATE broadcast_jobs SET message_text = $2 WHERE id = $1",
+            job_id, text
+        )
+
+    async def set_broadcast_job_status(self, job_id: int, status: str):
+        """Switch a live job between 'running' and 'paused'"""
+        await self.execute("""
+            UPDATE broadcast_jobs
+            SET status = $2
+            WHERE id = $1 AND status IN ('running', 'paused')
+        """, job_id, status)
+
+    async def cancel_broadcast_job(self, job_id: int) -> Dict:
+        """
+        Cancel a job: undelivered chats are marked 'cancelled',
+        delivered ones keep their 'sent' / 'failed' status.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    UPDATE broadcast_deliveries
+                    SET status = 'cancelled'
+                    WHERE job_id = $1 AND status IN ('pending', 'claimed')
+                """, job_id)
+
+                job = await conn.fetchrow("""
+                    UPDATE broadcast_jobs
+                    SET status = 'cancelled', finished_date = NOW()
+                    WHERE id = $1
+                    RETURNING *
+                """, job_id)
+
+                await conn.execute("""
+                    INSERT INTO broadcasts (
+                        admin_id, total_chats, success,
+                        failed, message_type, message_text
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                """, job["admin_id"], job["total"], job["success"],
+                    job["failed"], job["message_type"], job["message_text"])
+
+        return dict(job)
+
+    async def claim_deliveries(self, worker_id: str, limit: int) -> List[Dict]:
+        """
+        Claim a batch of pending deliveries of 'external' jobs for a
+        sender worker. FOR UPDATE SKIP LOCKED lets many workers share one queue
+        without ever claiming the same row twice.
+        """
+        rows = await self.fetch("""
+            UPDATE broadcast_deliveries d
+            SET status = 'claimed', claimed_by = $1, claimed_at = NOW()
+            FROM (
+                SELECT bd.job_id, bd.chat_id
+                FROM broadcast_deliveries bd
+                JOIN broadcast_jobs j ON j.id = bd.job_id
+                WHERE bd.status = 'pending'
+                  AND j.status = 'running'
+                  AND j.delivery_mode = 'external'
+                ORDER BY bd.job_id, bd.chat_id
+                LIMIT $2
+                FOR UPDATE OF bd SKIP LOCKED
+            ) c
+            WHERE d.job_id = c.job_id AND d.chat_id = c.chat_id
+            RETURNING d.job_id, d.chat_id
+        """, worker_id, limit)
+        return [dict(r) for r in rows]
+
+    async def release_stale_claims(self, timeout_seconds: int):
+        """
+        Return deliveries claimed by dead workers to the queue.
+        Sends they had already started are marked 'unconfirmed' instead,
+        so they are never posted twice.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    UPDATE broadcast_deliveries
+                    SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+                    WHERE status = 'claimed'
+                      AND claimed_at < NOW() - make_interval(secs => $1)
+                """, timeout_seconds)
+
+                await conn.execute("""
+                    UPDATE broadcast_deliveries
+                    SET status = 'unconfirmed'
+                    WHERE status = 'sending'
+                      AND claimed_at < NOW() - make_interval(secs => $1)
+                """, timeout_seconds)
+
+    async def finish_broadcast_job(self, job_id: int) -> Optional[Dict]:
+        """
+        Mark job as done and write its summary into broadcasts.
+        Returns None if the job still has undelivered chats
+        or was already finished by another worker.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                job = await conn.fetchrow("""
+                    UPDATE broadcast_jobs
+                    SET status = 'done', finished_date = NOW()
+                    WHERE id = $1
+                      AND status IN ('running', 'paused')
+                      AND NOT EXISTS (
+                          SELECT 1 FROM broadcast_deliveries
+                          WHERE job_id = $1
+                            AND status IN ('pending', 'claimed', 'sending')
+                      )
+                    RETURNING *
+                """, job_id)
+
+                if not job:
+                    return None
+
+                await conn.execute("""
+                    INSERT INTO broadcasts (
+                        admin_id, total_chats, success,
+                        failed, message_type, message_text
+                    )
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                """, job["admin_id"], job["total"], job["success"],
+                    job["failed"], job["message_type"], job["message_text"])
+
+        return dict(job)
+
+    # =====================================================
+    # SCHEDULED BROADCAST METHODS
+    # =====================================================
+
+    async def add_broadcast_schedule(
+        self,
+        admin_id: int,
+        source_chat_id: int,
+        source_message_id: int,
+        send_mode: str,
+        target: str,
+        next_run,
+        cron: Optional[str] = None,
+        chat_ids: Optional[List[int]] = None,
+        album_message_ids: Optional[List[int]] = None,
+        message_type: Optional[str] = None,
+        message_text: Optional[str] = None
+    ) -> Dict:
+        row = await self.fetchrow("""
+            INSERT INTO broadcast_schedules (
+                admin_id, source_chat_id, source_message_id,
+                album_message_ids, send_mode, message_type,
+                message_text, target, chat_ids, cron, next_run
+            )
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+            RETURNING *
+        """, admin_id, source_chat_id, source_message_id,
+            album_message_ids, send_mode, message_type,
+            message_text, target, chat_ids, cron, next_run)
+        return dict(row)
+
+    async def get_active_schedules(self) -> List[Dict]:
+        rows = await self.fetch("""
+            SELECT * FROM broadcast_schedules
+            WHERE is_active = TRUE
+            ORDER BY next_run
         """)
         return [dict(r) for r in rows]
+
+    async def set_schedule_next_run(self, schedule_id: int, next_run):
+        await self.execute("""
+            UPDATE broadcast_schedules
+            SET next_run = $2
+            WHERE id = $1
+        """, schedule_id, next_run)
+
+    async def deactivate_schedule(self, schedule_id: int) -> bool:
+        result = await self.execute("""
+            UPDATE broadcast_schedules
+            SET is_active = FALSE
+            WHERE id = $1 AND is_active = TRUE
+        """, schedule_id)
+        return result != "UPDATE 0"
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from typing import Set
+
+import asyncpg
+
+import config
+
+
+class RoleCache:
+    """
+    In-memory sets of admin and super admin ids.
+
+    Database updates them in place on every role change; a full reload
+    every `ttl` seconds picks up changes made by other processes.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, ttl: float | None = None):
+        self.pool = pool
+        self.ttl = config.ROLE_CACHE_TTL if ttl is None else ttl
+
+        self.admins: Set[int] = set()
+        self.super_admins: Set[int] = set()
+
+        self._expires = 0.0
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        """Reload both sets from the database"""
+        version = self._version
+
+        async with self.pool.acquire() as conn:
+            admins = await conn.fetch("SELECT user_id FROM admins")
+            super_admins = await conn.fetch("SELECT user_id FROM super_admins")
+
+        # A local change landed meanwhile: keep it, retry on next check
+        if version != self._version:
+            return
+
+        self.admins = {r["user_id"] for r in admins}
+        self.super_admins = {r["user_id"] for r in super_admins}
+        self._expires = time.monotonic() + self.ttl
+
+    async def fresh(self) -> "RoleCache":
+        """Return the cache, reloading it first if the TTL has passed"""
+        if time.monotonic() >= self._expires:
+            async with self._lock:
+                if time.monotonic() >= self._expires:
+                    await self.load()
+        return self
+
+    # =====================
+    # IN-PLACE UPDATES
+    # =====================
+
+    def set_admin(self, user_id: int, active: bool = True):
+        self._version += 1
+        (self.admins.add if active else self.admins.discard)(user_id)
+
+    def set_super_admin(self, user_id: int, active: bool = True):
+        self._version += 1
+        (self.super_admins.add if active else self.super_admins.discard)(user_id)
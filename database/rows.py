@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Optional
+
+import asyncpg
+
+
+class Row(asyncpg.Record):
+    """
+    Base of typed rows, used as asyncpg's record_class.
+
+    Rows are the Records asyncpg decodes into: no per-row dict copy,
+    no instance __dict__. They keep the mapping interface
+    (row["title"], row.get("title"), dict(row)) and add attribute
+    access for the annotated columns (row.title).
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class ChatRow(Row):
+    __slots__ = ()
+
+    id: int
+    chat_id: int
+    chat_type: str
+    title: Optional[str]
+    username: Optional[str]
+    invite_link: Optional[str]
+    description: Optional[str]
+    added_date: datetime
+    is_active: bool
+
+
+class UserRow(Row):
+    __slots__ = ()
+
+    user_id: int
+    username: Optional[str]
+    full_name: Optional[str]
+    first_seen: datetime
+
+
+class AdminRow(Row):
+    """Admin or super admin (super admins have no pin_code)"""
+
+    __slots__ = ()
+
+    user_id: int
+    username: Optional[str]
+    full_name: Optional[str]
+    pin_code: str
+    added_date: datetime
+
+
+class BroadcastRow(Row):
+    __slots__ = ()
+
+    id: int
+    admin_id: int
+    admin_username: Optional[str]
+    total_chats: int
+    success: int
+    failed: int
+    broadcast_date: datetime
+    message_type: Optional[str]
+    message_text: Optional[str]
@@ -6,6 +6,7 @@ from handlers.admin_panel import router as admin_router
 from handlers.users import router as users_router
 from handlers.delete_chat import router as delete_chat
 from handlers.echo import router as echo_router
+from handlers.search import router as search_router
 __all__ = [
     'start_router',
     'chat_member_router',
@@ -14,5 +15,6 @@ __all__ = [
     'admin_router',
     'users_router',
     'delete_chat',
-    'echo_router'
+    'echo_router',
+    'search_router'
 ]
@@ -1,7 +1,11 @@
 import asyncio
-from datetime import datetime, timedelta
+import html
+import re
+from datetime import datetime
+from typing import Dict, List
 
 from aiogram import Router, F
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
@@ -11,14 +15,36 @@ from keyboards import (
     cancel_keyboard,
     main_admin_menu,
     confirm_broadcast,
+    broadcast_control_keyboard,
+    confirm_cancel_keyboard,
     chat_selection_keyboard,
     chat_type_selection_keyboard
 )
-from utils import BroadcastStates
+from utils import (
+    BroadcastStates,
+    BroadcastProgress,
+    run_broadcast_job,
+    enqueue_broadcast_job
+)
+from utils.control import register_control, get_control
+from utils.jobs import get_target_chat_ids, message_ref
+from utils.pagination import PAGE_SIZE, decode_key, page_keys, total_pages
+from utils.selection import ChatSelection
+from utils.manage import ManageError, recall_broadcast, edit_broadcast
 from middlewares import AdminMiddleware
+from utils.cron import CronRule
 
 router = Router()
 router.message.middleware(AdminMiddleware())
+router.callback_query.middleware(AdminMiddleware())
+
+# Menu buttons keep working in the chat picker (not taken as a search)
+MENU_BUTTONS = {
+    button.text
+    for menu in (main_admin_menu(), broadcast_menu())
+    for row in menu.keyboard
+    for button in row
+}
 
 # ======================================================================
 # MAIN BROADCAST MENU
@@ -45,13 +71,13 @@ async def broadcast_to_all(message: Message, state: FSMContext):
 
 @router.message(F.text == "📺 Channels only")
 async def broadcast_to_channels(message: Message, state: FSMContext, db):
-    channels = await db.get_chats_by_type("channel")
+    channels = db.count_active_chats("channel")
 
     if not channels:
         return await message.answer("❌ No channels found!")
 
     await message.answer(
-        f"📺 Message will be sent to {len(channels)} channels.\n\n"
+        f"📺 Message will be sent to {channels} channels.\n\n"
         "📝 Send your message.",
         reply_markup=cancel_keyboard()
     )
@@ -61,13 +87,13 @@ async def broadcast_to_channels(message: Message, state: FSMContext, db):
 
 @router.message(F.text == "👥 Groups only")
 async def broadcast_to_groups(message: Message, state: FSMContext, db):
-    groups = await db.get_chats_by_type("group")
+    groups = db.count_active_chats("group")
 
     if not groups:
         return await message.answer("❌ No groups found!")
 
     await message.answer(
-        f"👥 Message will be sent to {len(groups)} groups.\n\n"
+        f"👥 Message will be sent to {groups} groups.\n\n"
         "📝 Send your message.",
         reply_markup=cancel_keyboard()
     )
@@ -77,13 +103,13 @@ async def broadcast_to_groups(message: Message, state: FSMContext, db):
 
 @router.message(F.text == "🔥 Supergroups only")
 async def broadcast_to_supergroups(message: Message, state: FSMContext, db):
-    supergroups = await db.get_chats_by_type("supergroup")
+    supergroups = db.count_active_chats("supergroup")
 
     if not supergroups:
         return await message.answer("❌ No supergroups found!")
 
     await message.answer(
-        f"🔥 Message will be sent to {len(supergroups)} supergroups.\n\n"
+        f"🔥 Message will be sent to {supergroups} supergroups.\n\n"
         "📝 Send your message.",
         reply_markup=cancel_keyboard()
     )
@@ -103,7 +129,10 @@ async def broadcast_select_type(message: Message, state: FSMContext):
 # CHAT SELECTION (INLINE)
 # ======================================================================
 
-@router.callback_query(BroadcastStates.selecting_chats, F.data == "back_to_menu")
+@router.callback_query(
+    BroadcastStates.selecting_chats,
+    F.data.in_({"back_to_menu", "cancel_selection"})
+)
 async def back_to_menu(callback: CallbackQuery, state: FSMContext):
     await callback.answer("❌ Cancelled")
     await callback.message.edit_text("❌ Process cancelled.")
@@ -114,48 +143,154 @@ async def back_to_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
 
 
+PICKER_TITLES = {
+    "channel": ("📺 Channels", "❌ No channels found!"),
+    "group": ("👥 Groups", "❌ No groups found!"),
+    None: ("📋 All chats", "❌ No chats found!")
+}
+
+
+async def picker_chats(db, selection: ChatSelection, cursor: str | None, query: str | None) -> list:
+    """
+    Chats of one picker view: search results for `query`, otherwise
+    the page opened with the keyset `cursor`.
+    """
+    if query:
+        found = db.search_chats(query, selection.chat_type, limit=PAGE_SIZE)
+        return [chat.as_dict() for chat in found]
+
+    after, before = decode_key(cursor) if cursor else (None, None)
+    return await db.page_chats(selection.chat_type, after=after, before=before, limit=PAGE_SIZE)
+
+
+async def show_picker(
+    message: Message,
+    state: FSMContext,
+    db,
+    selection: ChatSelection,
+    page: int = 1,
+    cursor: str | None = None,
+    query: str | None = None,
+    chats: list | None = None,
+    edit: bool = True
+):
+    """
+    Draw the current picker view and save it with the selection.
+    """
+    if chats is None:
+        chats = await picker_chats(db, selection, cursor, query)
+
+    # Chats were removed meanwhile: back to the first page
+    if not chats and cursor:
+        page, cursor = 1, None
+        chats = await picker_chats(db, selection, cursor, query)
+
+    await state.update_data(
+        picker_page=page,
+        picker_cursor=cursor,
+        picker_query=query,
+        **selection.to_data()
+    )
+
+    title, empty = PICKER_TITLES[selection.chat_type]
+    send = message.edit_text if edit else message.answer
+
+    if query and not chats:
+        return await send(
+            f"🔍 Nothing found for <b>{html.escape(query)}</b>.",
+            reply_markup=chat_selection_keyboard([], search=True)
+        )
+    if not chats:
+        return await send(empty)
+
+    total = selection.total(db)
+    selected = selection.count(total)
+    selected_ids = {c["chat_id"] for c in chats if selection.is_selected(c["chat_id"])}
+
+    if query:
+        text = f"🔍 <b>{html.escape(query)}</b> in {title.lower()}, selected: {selected}"
+        keyboard = chat_selection_keyboard(chats, selected_ids, selected, search=True)
+    else:
+        text = f"{title} ({total}), selected: {selected}"
+        prev_key, next_key = page_keys(chats, "added_date", "id")
+        keyboard = chat_selection_keyboard(
+            chats, selected_ids, selected, page, total_pages(total), prev_key, next_key
+        )
+
+    try:
+        await send(text, reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e).lower():
+            raise
+
+
+async def current_picker(state: FSMContext):
+    """
+    Selection and view (page, cursor, query) saved by the last show_picker().
+    """
+    data = await state.get_data()
+    view = {
+        "page": data["picker_page"],
+        "cursor": data["picker_cursor"],
+        "query": data.get("picker_query")
+    }
+    return ChatSelection.from_data(data), view
+
+
 @router.callback_query(BroadcastStates.selecting_chats, F.data == "select_channels")
 async def select_channels(callback: CallbackQuery, state: FSMContext, db):
-    channels = await db.get_chats_by_type("channel")
     await callback.answer()
-
-    if not channels:
-        return await callback.message.edit_text("❌ No channels found!")
-
-    await state.update_data(available_chats=channels, selected_chat_ids=[])
-    await callback.message.edit_text(
-        f"📺 Channels ({len(channels)}):",
-        reply_markup=chat_selection_keyboard(channels, [])
-    )
+    await show_picker(callback.message, state, db, ChatSelection("channel"))
 
 
 @router.callback_query(BroadcastStates.selecting_chats, F.data == "select_groups")
 async def select_groups(callback: CallbackQuery, state: FSMContext, db):
-    groups = await db.get_chats_by_type("group")
     await callback.answer()
-
-    if not groups:
-        return await callback.message.edit_text("❌ No groups found!")
-
-    await state.update_data(available_chats=groups, selected_chat_ids=[])
-    await callback.message.edit_text(
-        f"👥 Groups ({len(groups)}):",
-        reply_markup=chat_selection_keyboard(groups, [])
-    )
+    await show_picker(callback.message, state, db, ChatSelection("group"))
 
 
 @router.callback_query(BroadcastStates.selecting_chats, F.data == "select_all_chats")
 async def select_all_chats(callback: CallbackQuery, state: FSMContext, db):
-    chats = await db.get_all_chats()
     await callback.answer()
+    await show_picker(callback.message, state, db, ChatSelection())
 
-    if not chats:
-        return await callback.message.edit_text("❌ No chats found!")
 
-    await state.update_data(available_chats=chats, selected_chat_ids=[])
-    await callback.message.edit_text(
-        f"📋 All chats ({len(chats)}):",
-        reply_markup=chat_selection_keyboard(chats, [])
+@router.callback_query(BroadcastStates.selecting_chats, F.data.startswith("pick_page_"))
+async def picker_page(callback: CallbackQuery, state: FSMContext, db):
+    selection, _ = await current_picker(state)
+
+    # "pick_page_<n>[_<cursor>]": the cursor is kept to redraw this page
+    page, _, cursor = callback.data.removeprefix("pick_page_").partition("_")
+
+    await callback.answer()
+    await show_picker(callback.message, state, db, selection, int(page), cursor or None)
+
+
+@router.message(
+    BroadcastStates.selecting_chats,
+    F.text,
+    ~F.text.in_(MENU_BUTTONS),
+    ~F.text.startswith("/")
+)
+async def picker_search(message: Message, state: FSMContext, db):
+    """
+    Any text while picking chats is a search (an id works too, e.g.
+    from an inline query result), except menu buttons and commands.
+    Results are sent as a new picker.
+    """
+    if message.text == "❌ Cancel":
+        await message.answer("❌ Process cancelled.", reply_markup=main_admin_menu())
+        await state.clear()
+        return
+
+    data = await state.get_data()
+    if "selection" not in data:
+        return await message.answer("🎯 Choose a chat type first.")
+
+    selection, view = await current_picker(state)
+    await show_picker(
+        message, state, db, selection,
+        view["page"], view["cursor"], query=message.text.strip(), edit=False
     )
 
 # ======================================================================
@@ -166,35 +301,53 @@ async def select_all_chats(callback: CallbackQuery, state: FSMContext, db):
     BroadcastStates.selecting_chats,
     F.data.startswith("toggle_chat_")
 )
-async def toggle_chat(callback: CallbackQuery, state: FSMContext):
+async def toggle_chat(callback: CallbackQuery, state: FSMContext, db):
     chat_id = int(callback.data.split("_")[2])
+    selection, view = await current_picker(state)
 
-    data = await state.get_data()
-    selected = data["selected_chat_ids"]
-    available = data["available_chats"]
-
-    if chat_id in selected:
-        selected.remove(chat_id)
-        await callback.answer("❌ Removed")
-    else:
-        selected.append(chat_id)
+    if selection.toggle(chat_id):
         await callback.answer("✅ Selected")
+    else:
+        await callback.answer("❌ Removed")
 
-    await state.update_data(selected_chat_ids=selected)
+    await show_picker(callback.message, state, db, selection, **view)
 
-    await callback.message.edit_text(
-        f"Selected: {len(selected)} chats",
-        reply_markup=chat_selection_keyboard(available, selected)
-    )
+
+@router.callback_query(BroadcastStates.selecting_chats, F.data == "pick_on_page")
+async def pick_on_page(callback: CallbackQuery, state: FSMContext, db):
+    selection, view = await current_picker(state)
+    chats = await picker_chats(db, selection, view["cursor"], view["query"])
+    chat_ids = [c["chat_id"] for c in chats]
+
+    # Select the whole page, or clear it when it is already selected
+    selected = not all(selection.is_selected(chat_id) for chat_id in chat_ids)
+    selection.set_many(chat_ids, selected)
+
+    await callback.answer("✅ Page selected" if selected else "❌ Page cleared")
+    await show_picker(callback.message, state, db, selection, **view, chats=chats)
+
+
+@router.callback_query(BroadcastStates.selecting_chats, F.data.in_({"pick_all", "pick_invert"}))
+async def pick_all_or_invert(callback: CallbackQuery, state: FSMContext, db):
+    selection, view = await current_picker(state)
+
+    if callback.data == "pick_all":
+        selection.select_all()
+        await callback.answer("✅ All selected")
+    else:
+        selection.invert()
+        await callback.answer("🔄 Selection inverted")
+
+    await show_picker(callback.message, state, db, selection, **view)
 
 # ======================================================================
 # CONFIRM CHAT SELECTION
 # ======================================================================
 
 @router.callback_query(BroadcastStates.selecting_chats, F.data == "confirm_selected")
-async def confirm_selected(callback: CallbackQuery, state: FSMContext):
-    data = await state.get_data()
-    selected = data["selected_chat_ids"]
+async def confirm_selected(callback: CallbackQuery, state: FSMContext, db):
+    selection, _ = await current_picker(state)
+    selected = selection.count(selection.total(db))
 
     if not selected:
         return await callback.answer(
@@ -205,7 +358,7 @@ async def confirm_selected(callback: CallbackQuery, state: FSMContext):
     await state.update_data(target="selected")
 
     await callback.message.edit_text(
-        f"✅ {len(selected)} chats selected.\n📝 Send your message."
+        f"✅ {selected} chats selected.\n📝 Send your message."
     )
     await callback.message.answer(
         "Send message:",
@@ -215,47 +368,75 @@ async def confirm_selected(callback: CallbackQuery, state: FSMContext):
     await state.set_state(BroadcastStates.waiting_for_message)
 
 # ======================================================================
-# MESSAGE RECEIVING + ALBUM PROTECTION
+# MESSAGE RECEIVING + ALBUM COLLECTION
 # ======================================================================
 
-album_block_cache = {}  # { user_id: expire_time }
+ALBUM_WINDOW = 1.0  # seconds to wait for the rest of an album
 
+album_buffers: Dict[int, List[Message]] = {}      # { user_id: album messages }
+album_tasks: Dict[int, asyncio.Task] = {}         # { user_id: debounce task }
 
-def clean_album_cache():
-    now = datetime.now()
-    for uid in list(album_block_cache.keys()):
-        if album_block_cache[uid] < now:
-            del album_block_cache[uid]
+
+async def finalize_album(user_id: int, state: FSMContext, db):
+    """
+    Wait until no new album part arrives for ALBUM_WINDOW seconds,
+    then continue with the whole album in order.
+    """
+    await asyncio.sleep(ALBUM_WINDOW)
+
+    album_tasks.pop(user_id, None)
+    album = sorted(album_buffers.pop(user_id, []), key=lambda m: m.message_id)
+
+    if album:
+        await finalize_input(album[0], state, db, album_group=album)
 
 
 @router.message(BroadcastStates.waiting_for_message)
 async def receive_message(message: Message, state: FSMContext, db):
     user_id = message.from_user.id
 
-    clean_album_cache()
-
-    # ❌ Album detected
+    # 🖼 Album part → buffer it and restart the debounce window
     if message.media_group_id:
-        if user_id not in album_block_cache:
-            album_block_cache[user_id] = datetime.now() + timedelta(seconds=8)
-
-            await state.clear()
-            await message.answer(
-                "❌ <b>Album messages are not supported.</b>\n\n"
-                "Please send only one message, photo, video or file.",
-                parse_mode="HTML",
-                reply_markup=main_admin_menu()
-            )
+        album_buffers.setdefault(user_id, []).append(message)
+
+        task = album_tasks.pop(user_id, None)
+        if task:
+            task.cancel()
+
+        album_tasks[user_id] = asyncio.create_task(
+            finalize_album(user_id, state, db)
+        )
         return
 
-    album_block_cache.pop(user_id, None)
     return await finalize_input(message, state, db)
 
 # ======================================================================
 # FINALIZE MESSAGE & PIN CONFIRMATION
 # ======================================================================
 
-async def finalize_input(message: Message, state: FSMContext, db):
+def resolve_target_chats(data: dict, db):
+    """
+    Resolve broadcast target from FSM data, in memory.
+    Returns (chat_ids, target_text).
+    """
+    target = data["target"]
+
+    if target == "selected":
+        chat_ids = ChatSelection.from_data(data).resolve(db)
+        target_text = f"{len(chat_ids)} selected chats"
+    else:
+        chat_ids = get_target_chat_ids(db, target)
+        target_text = "all chats" if target == "all" else target
+
+    return chat_ids, target_text
+
+
+async def finalize_input(
+    message: Message,
+    state: FSMContext,
+    db,
+    album_group: List[Message] | None = None
+):
     if message.text == "❌ Cancel":
         await message.answer(
             "❌ Process cancelled.",
@@ -265,39 +446,467 @@ async def finalize_input(message: Message, state: FSMContext, db):
         return
 
     data = await state.get_data()
-    target = data["target"]
-
-    if target == "all":
-        chats = await db.get_all_chats()
-        target_text = "all chats"
-    elif target == "channels":
-        chats = await db.get_chats_by_type("channel")
-        target_text = "channels"
-    elif target == "groups":
-        chats = await db.get_chats_by_type("group")
-        target_text = "groups"
-    elif target == "supergroups":
-        chats = await db.get_chats_by_type("supergroup")
-        target_text = "supergroups"
-    else:
-        ids = data["selected_chat_ids"]
-        available = data["available_chats"]
-        chats = [c for c in available if c["chat_id"] in ids]
-        target_text = f"{len(chats)} selected chats"
+    chat_ids, target_text = resolve_target_chats(data, db)
 
-    if not chats:
+    if not chat_ids:
         await state.clear()
         return await message.answer("❌ No chats found!")
 
+    # A reference only: Message objects are not kept in FSM data
+    await state.update_data(source=message_ref(message, album_group))
+
+    album_text = f"🖼 Album of {len(album_group)} items.\n" if album_group else ""
+
+    await message.answer(
+        f"🔐 Message will be sent to <b>{target_text}</b>.\n"
+        f"{album_text}\n"
+        "Enter your PIN code:",
+        reply_markup=cancel_keyboard()
+    )
+
+    await state.set_state(BroadcastStates.waiting_for_pin)
+
+
+@router.message(BroadcastStates.waiting_for_pin)
+async def check_broadcast_pin(message: Message, state: FSMContext, db):
+    if message.text == "❌ Cancel":
+        await message.answer(
+            "❌ Process cancelled.",
+            reply_markup=main_admin_menu()
+        )
+        await state.clear()
+        return
+
+    if not message.text or not re.fullmatch(r"\d{4}", message.text):
+        return await message.answer("❌ PIN must consist of exactly 4 digits!")
+
+    if not await db.verify_pin(message.from_user.id, message.text):
+        await message.answer(
+            "❌ Invalid PIN!",
+            reply_markup=main_admin_menu()
+        )
+        await state.clear()
+        return
+
+    await message.answer(
+        "✅ PIN confirmed.",
+        reply_markup=main_admin_menu()
+    )
+    await message.answer(
+        "📨 Choose how to send the message:",
+        reply_markup=confirm_broadcast()
+    )
+
+    await state.set_state(BroadcastStates.confirm)
+
+# ======================================================================
+# CANCEL BROADCAST
+# ======================================================================
+
+@router.callback_query(BroadcastStates.confirm, F.data == "cancel_broadcast")
+async def cancel_broadcast(callback: CallbackQuery, state: FSMContext):
+    await callback.answer("❌ Cancelled")
+    await callback.message.edit_text("❌ Broadcast cancelled.")
+    await state.clear()
+
+# ======================================================================
+# SCHEDULING
+# ======================================================================
+
+def parse_schedule(text: str):
+    """
+    Parse "YYYY-MM-DD HH:MM" (one time) or a 5-field cron rule (recurring).
+    Returns (next_run, cron) or None if the text is invalid.
+    """
+    text = (text or "").strip()
+
+    try:
+        run_at = datetime.strptime(text, "%Y-%m-%d %H:%M")
+        return (run_at, None) if run_at > datetime.now() else None
+    except ValueError:
+        pass
+
+    try:
+        return CronRule(text).next_after(datetime.now()), text
+    except ValueError:
+        return None
+
+
+@router.callback_query(BroadcastStates.confirm, F.data == "schedule_broadcast")
+async def schedule_broadcast(callback: CallbackQuery, state: FSMContext):
+    await callback.answer()
+    await callback.message.edit_text(
+        "⏰ <b>Schedule broadcast</b>\n\n"
+        "Send the date and time:\n"
+        "<code>2025-01-31 09:00</code>\n\n"
+        "or a recurring cron rule (minute hour day month weekday):\n"
+        "<code>0 9 * * 1</code> — every Monday at 09:00",
+        parse_mode="HTML"
+    )
+    await state.set_state(BroadcastStates.schedule_time)
+
+
+@router.message(BroadcastStates.schedule_time)
+async def receive_schedule_time(message: Message, state: FSMContext):
+    if message.text == "❌ Cancel":
+        await message.answer(
+            "❌ Process cancelled.",
+            reply_markup=main_admin_menu()
+        )
+        await state.clear()
+        return
+
+    parsed = parse_schedule(message.text)
+
+    if not parsed:
+        return await message.answer(
+            "❌ Invalid time! Use <code>YYYY-MM-DD HH:MM</code> "
+            "in the future or a 5-field cron rule.",
+            parse_mode="HTML"
+        )
+
+    next_run, cron = parsed
     await state.update_data(
-        broadcast_message=message,
-        album_group=None
+        schedule_at=next_run.isoformat(),
+        schedule_cron=cron
     )
 
+    repeat_text = f"\n🔁 Repeats: <code>{cron}</code>" if cron else ""
     await message.answer(
-        f"🔐 Message will be sent to <b>{target_text}</b>.\n\n"
+        f"⏰ First run: <b>{next_run:%Y-%m-%d %H:%M}</b>{repeat_text}\n\n"
+        "📨 Choose how to send the message:",
+        reply_markup=confirm_broadcast(with_schedule=False),
+        parse_mode="HTML"
+    )
+    await state.set_state(BroadcastStates.confirm)
+
+
+async def save_schedule(
+    callback: CallbackQuery,
+    data: dict,
+    chat_ids: list,
+    send_mode: str,
+    db,
+    scheduler
+):
+    target = data["target"]
+
+    schedule = await db.add_broadcast_schedule(
+        admin_id=callback.from_user.id,
+        send_mode=send_mode,
+        target=target,
+        next_run=datetime.fromisoformat(data["schedule_at"]),
+        cron=data.get("schedule_cron"),
+        chat_ids=chat_ids if target == "selected" else None,
+        **data["source"]
+    )
+    scheduler.add(schedule)
+
+    await callback.message.edit_text(
+        f"⏰ Broadcast <b>#{schedule['id']}</b> scheduled for "
+        f"<b>{schedule['next_run']:%Y-%m-%d %H:%M}</b>.\n"
+        "📋 List: /schedules",
+        parse_mode="HTML"
+    )
+
+# ======================================================================
+# SEND BROADCAST
+# ======================================================================
+
+@router.callback_query(
+    BroadcastStates.confirm,
+    F.data.in_({"send_forward", "send_copy"})
+)
+async def start_broadcast(callback: CallbackQuery, state: FSMContext, db, scheduler):
+    send_mode = "forward" if callback.data == "send_forward" else "copy"
+
+    data = await state.get_data()
+    await state.clear()
+
+    chat_ids, target_text = resolve_target_chats(data, db)
+
+    await callback.answer()
+
+    if not chat_ids:
+        return await callback.message.edit_text("❌ No chats found!")
+
+    if data.get("schedule_at"):
+        return await save_schedule(callback, data, chat_ids, send_mode, db, scheduler)
+
+    # Delivery happens in sender_worker.py processes
+    if config.BROADCAST_EXTERNAL_SENDERS:
+        job_id = await enqueue_broadcast_job(
+            db=db,
+            admin_id=callback.from_user.id,
+            chat_ids=chat_ids,
+            source=data["source"],
+            send_mode=send_mode,
+            delivery_mode="external"
+        )
+        return await callback.message.edit_text(
+            f"📥 Broadcast <b>#{job_id}</b> to <b>{target_text}</b> "
+            f"({len(chat_ids)}) is queued.\n"
+            "You will be notified when it is finished.",
+            parse_mode="HTML"
+        )
+
+    job_id = await enqueue_broadcast_job(
+        db=db,
+        admin_id=callback.from_user.id,
+        chat_ids=chat_ids,
+        source=data["source"],
+        send_mode=send_mode
+    )
+    control = register_control(job_id)
+
+    await callback.message.edit_text(
+        f"⏳ Sending to <b>{target_text}</b> ({len(chat_ids)})...",
+        parse_mode="HTML",
+        reply_markup=broadcast_control_keyboard(job_id)
+    )
+
+    # Job is persisted, so an interrupted broadcast resumes after restart
+    progress = BroadcastProgress(callback.message, target_text, control)
+    async with progress:
+        stats = await run_broadcast_job(
+            bot=callback.bot,
+            db=db,
+            job_id=job_id,
+            on_progress=progress.update,
+            control=control
+        )
+
+    if control.cancelled:
+        return await callback.message.edit_text(
+            f"⛔ <b>Broadcast #{job_id} cancelled!</b>\n\n"
+            f"📋 Total: <b>{stats['total']}</b>\n"
+            f"✅ Delivered before cancel: <b>{stats['success']}</b>\n"
+            f"❌ Failed: <b>{stats['failed']}</b>",
+            parse_mode="HTML"
+        )
+
+    result_text = (
+        "✅ <b>Broadcast finished!</b>\n\n"
+        f"📋 Total: <b>{stats['total']}</b>\n"
+        f"✅ Successful: <b>{stats['success']}</b>\n"
+        f"❌ Failed: <b>{stats['failed']}</b>\n\n"
+        f"🗑 Recall: /recall_{job_id}\n"
+        f"✏️ Edit: /edit_{job_id}"
+    )
+
+    await callback.message.edit_text(result_text, parse_mode="HTML")
+
+    try:
+        await callback.bot.send_message(
+            config.LOG_CHANNEL_ID,
+            "📢 <b>BROADCAST SENT</b>\n\n"
+            f"👤 Sent by: {html.escape(callback.from_user.full_name)}\n"
+            f"🆔 Admin ID: <code>{callback.from_user.id}</code>\n"
+            f"🎯 Target: {target_text}\n"
+            f"✅ Successful: {stats['success']} / {stats['total']}",
+            parse_mode="HTML"
+        )
+    except Exception:
+        pass
+
+# ======================================================================
+# PAUSE / RESUME / CANCEL RUNNING BROADCAST
+# ======================================================================
+
+@router.callback_query(F.data.regexp(r"^bc_(pause|resume)_\d+$"))
+async def toggle_broadcast_pause(callback: CallbackQuery, db):
+    _, action, job_id = callback.data.split("_")
+    job_id = int(job_id)
+
+    control = get_control(job_id)
+    if not control:
+        return await callback.answer("❌ Broadcast is not running.", show_alert=True)
+
+    if action == "pause":
+        control.pause()
+        await db.set_broadcast_job_status(job_id, "paused")
+        await callback.answer("⏸ Paused")
+    else:
+        control.resume()
+        await db.set_broadcast_job_status(job_id, "running")
+        await callback.answer("▶️ Resumed")
+
+    await callback.message.edit_reply_markup(
+        reply_markup=broadcast_control_keyboard(job_id, control.paused)
+    )
+
+
+@router.callback_query(F.data.regexp(r"^bc_cancel_\d+$"))
+async def ask_cancel_broadcast(callback: CallbackQuery, state: FSMContext):
+    job_id = int(callback.data.split("_")[2])
+
+    if not get_control(job_id):
+        return await callback.answer("❌ Broadcast is not running.", show_alert=True)
+
+    await callback.answer()
+    await callback.message.edit_reply_markup(
+        reply_markup=confirm_cancel_keyboard(job_id)
+    )
+    await state.set_state(BroadcastStates.confirm_cancel)
+    await state.update_data(cancel_job_id=job_id)
+
+
+@router.callback_query(
+    BroadcastStates.confirm_cancel,
+    F.data.regexp(r"^bc_cancel_(yes|no)_\d+$")
+)
+async def confirm_cancel_broadcast(callback: CallbackQuery, state: FSMContext):
+    job_id = int(callback.data.split("_")[3])
+    await state.clear()
+
+    control = get_control(job_id)
+    if not control:
+        return await callback.answer("❌ Broadcast is not running.", show_alert=True)
+
+    if callback.data.startswith("bc_cancel_yes"):
+        # Takes effect before the next send; delivered chats stay recorded
+        control.cancel()
+        return await callback.answer("⛔ Cancelling...")
+
+    await callback.answer()
+    await callback.message.edit_reply_markup(
+        reply_markup=broadcast_control_keyboard(job_id, control.paused)
+    )
+
+# ======================================================================
+# SCHEDULED BROADCASTS LIST
+# ======================================================================
+
+@router.message(F.text == "/schedules")
+async def list_schedules(message: Message, db):
+    schedules = await db.get_active_schedules()
+
+    if not schedules:
+        return await message.answer("⏰ No scheduled broadcasts.")
+
+    text = "⏰ <b>SCHEDULED BROADCASTS</b>\n\n"
+
+    for schedule in schedules:
+        repeat = f"🔁 <code>{schedule['cron']}</code>\n" if schedule["cron"] else ""
+        text += (
+            f"#{schedule['id']} — 🎯 {schedule['target']}\n"
+            f"🕒 Next run: {schedule['next_run']:%Y-%m-%d %H:%M}\n"
+            f"{repeat}"
+            f"❌ Cancel: /unschedule_{schedule['id']}\n\n"
+        )
+
+    await message.answer(text, parse_mode="HTML")
+
+
+@router.message(F.text.regexp(r"^/unschedule_(\d+)$"))
+async def cancel_schedule(message: Message, db, scheduler):
+    schedule_id = int(message.text.split("_")[1])
+
+    if not await db.deactivate_schedule(schedule_id):
+        return await message.answer("❌ Scheduled broadcast not found!")
+
+    scheduler.remove(schedule_id)
+    await message.answer(f"✅ Scheduled broadcast #{schedule_id} cancelled.")
+
+# ======================================================================
+# RECALL / EDIT SENT BROADCAST
+# ======================================================================
+
+@router.message(F.text.regexp(r"^/recall_(\d+)$"))
+async def ask_recall_broadcast(message: Message, state: FSMContext):
+    job_id = int(message.text.split("_")[1])
+
+    await state.set_state(BroadcastStates.manage_pin)
+    await state.update_data(manage_action="recall", manage_job_id=job_id)
+
+    await message.answer(
+        f"🗑 Broadcast <b>#{job_id}</b> will be deleted from all chats.\n\n"
         "Enter your PIN code:",
+        parse_mode="HTML",
         reply_markup=cancel_keyboard()
     )
 
-    await state.set_state(BroadcastStates.waiting_for_pin)
+
+@router.message(F.text.regexp(r"^/edit_(\d+)$"))
+async def ask_edit_broadcast(message: Message, state: FSMContext):
+    job_id = int(message.text.split("_")[1])
+
+    await state.set_state(BroadcastStates.edit_text)
+    await state.update_data(manage_action="edit", manage_job_id=job_id)
+
+    await message.answer(
+        f"✏️ Send the new text (or caption) for broadcast <b>#{job_id}</b>:",
+        parse_mode="HTML",
+        reply_markup=cancel_keyboard()
+    )
+
+
+@router.message(BroadcastStates.edit_text)
+async def receive_edit_text(message: Message, state: FSMContext):
+    if message.text == "❌ Cancel":
+        await message.answer("❌ Process cancelled.", reply_markup=main_admin_menu())
+        await state.clear()
+        return
+
+    if not message.text:
+        return await message.answer("❌ Please send text!")
+
+    await state.update_data(manage_text=message.html_text)
+    await state.set_state(BroadcastStates.manage_pin)
+
+    await message.answer("🔐 Enter your PIN code:", reply_markup=cancel_keyboard())
+
+
+@router.message(BroadcastStates.manage_pin)
+async def run_manage_action(message: Message, state: FSMContext, db):
+    if message.text == "❌ Cancel":
+        await message.answer("❌ Process cancelled.", reply_markup=main_admin_menu())
+        await state.clear()
+        return
+
+    if not message.text or not re.fullmatch(r"\d{4}", message.text):
+        return await message.answer("❌ PIN must consist of exactly 4 digits!")
+
+    data = await state.get_data()
+    await state.clear()
+
+    if not await db.verify_pin(message.from_user.id, message.text):
+        return await message.answer("❌ Invalid PIN!", reply_markup=main_admin_menu())
+
+    job_id = data["manage_job_id"]
+    recall = data["manage_action"] == "recall"
+
+    await message.answer("✅ PIN confirmed.", reply_markup=main_admin_menu())
+    status = await message.answer(
+        f"⏳ {'Recalling' if recall else 'Editing'} broadcast #{job_id}..."
+    )
+
+    progress = BroadcastProgress(
+        status,
+        f"broadcast #{job_id}",
+        action="Recalling" if recall else "Editing"
+    )
+
+    try:
+        async with progress:
+            if recall:
+                stats = await recall_broadcast(
+                    message.bot, db, job_id, on_progress=progress.update
+                )
+            else:
+                stats = await edit_broadcast(
+                    message.bot, db, job_id, data["manage_text"],
+                    on_progress=progress.update
+                )
+    except ManageError as e:
+        return await status.edit_text(f"❌ {e}")
+
+    title = "🗑 <b>Broadcast recalled!</b>" if recall else "✏️ <b>Broadcast edited!</b>"
+
+    await status.edit_text(
+        f"{title}\n\n"
+        f"📋 Total: <b>{stats['total']}</b>\n"
+        f"✅ Successful: <b>{stats['success']}</b>\n"
+        f"❌ Failed: <b>{stats['failed']}</b>",
+        parse_mode="HTML"
+    )
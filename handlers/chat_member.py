@@ -53,7 +53,7 @@ async def on_bot_added(event: ChatMemberUpdated, db):
         )
 
         # Statistics
-        stats = await db.get_chat_stats()
+        stats = await db.get_chat_type_counts()
         total_places = stats["total"]
 
         username_display = f"@{chat.username}" if chat.username else "❌ No username"
@@ -104,7 +104,7 @@ async def on_bot_added(event: ChatMemberUpdated, db):
         # Remove chat from database
         await db.delete_chat(chat.id)
 
-        stats = await db.get_chat_stats()
+        stats = await db.get_chat_type_counts()
         total_places = stats["total"]
 
         try:
@@ -31,7 +31,8 @@ async def delete_chat_start(message: Message, state: FSMContext, db):
     await message.answer(
         "🗑 <b>Delete chat</b>\n\n"
         "Please send the chat ID you want to delete:\n"
-        "Example: <code>-1001234567890</code>",
+        "Example: <code>-1001234567890</code>\n\n"
+        "🔍 Or send part of its title / username to find it.",
         reply_markup=cancel_keyboard(),
         parse_mode="HTML"
     )
@@ -53,9 +54,18 @@ async def get_chat_id_for_delete(message: Message, state: FSMContext, db):
 
     try:
         chat_id = int(message.text)
-    except ValueError:
-        await message.answer("❌ Chat ID must be a number!")
-        return
+    except (TypeError, ValueError):
+        # Not an id: search by title / username instead
+        found = db.search_chats(message.text or "", limit=10)
+
+        if not found:
+            return await message.answer("❌ No chats found. Send the chat ID or another search.")
+
+        text = "🔍 <b>Found chats</b> — send the ID of the one to delete:\n\n"
+        for chat in found:
+            text += f"• {html.escape(chat.title)} — <code>{chat.chat_id}</code>\n"
+
+        return await message.answer(text, parse_mode="HTML")
 
     chat = await db.get_chat_by_id(chat_id)
 
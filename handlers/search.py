@@ -0,0 +1,34 @@
+from aiogram import Router
+from aiogram.types import InlineQuery, InlineQueryResultArticle, InputTextMessageContent
+
+router = Router()
+
+CHAT_TYPE_ICONS = {"channel": "📺", "group": "👥", "supergroup": "🔥"}
+
+
+@router.inline_query()
+async def inline_chat_search(query: InlineQuery, db):
+    """
+    Inline chat lookup for admins: "@bot news".
+    Picking a result sends the chat ID, which the chat picker
+    and the delete flow accept as input.
+    """
+    if not await db.is_admin(query.from_user.id):
+        return await query.answer([], cache_time=60, is_personal=True)
+
+    chats = db.search_chats(query.query, limit=50) if query.query.strip() else []
+
+    results = [
+        InlineQueryResultArticle(
+            id=str(chat.chat_id),
+            title=chat.title or "Unknown",
+            description=(
+                f"{CHAT_TYPE_ICONS.get(chat.chat_type, '💬')} {chat.chat_type}"
+                f"{f' · @{chat.username}' if chat.username else ''} · {chat.chat_id}"
+            ),
+            input_message_content=InputTextMessageContent(message_text=str(chat.chat_id))
+        )
+        for chat in chats
+    ]
+
+    await query.answer(results, cache_time=5, is_personal=True)
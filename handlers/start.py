@@ -8,8 +8,31 @@ import config
 router = Router()
 
 
+async def notify_new_users(bot, db, users: list):
+    """
+    Tell admins about new users: (user_id, username, full_name) tuples.
+    A burst is reported as one summary instead of a message per user.
+    """
+    if len(users) == 1:
+        user_id, username, full_name = users[0]
+        text = (
+            "🟢 <b>New user started the bot</b>\n\n"
+            f"👤 Name: {full_name}\n"
+            f"🆔 ID: <code>{user_id}</code>\n"
+            f"🔗 Username: @{username or 'none'}"
+        )
+    else:
+        text = f"🟢 <b>{len(users)} new users started the bot</b>"
+
+    for admin_id in list((await db.roles.fresh()).admins):
+        try:
+            await bot.send_message(admin_id, text, parse_mode="HTML")
+        except Exception:
+            pass
+
+
 @router.message(CommandStart())
-async def cmd_start(message: Message, bot, db):
+async def cmd_start(message: Message, bot, db, user_writer=None):
     """
     Handle /start command.
     Registers user, detects role (admin / super admin / user)
@@ -18,36 +41,28 @@ async def cmd_start(message: Message, bot, db):
     user = message.from_user
 
     # 1️⃣ Save or update user in database
-    is_new = await db.add_user(
-        user_id=user.id,
-        username=user.username,
-        full_name=user.full_name
-    )
+    # (buffered writes notify about new users after the flush)
+    if user_writer:
+        user_writer.add(user.id, user.username, user.full_name)
+        is_new = False
+    else:
+        is_new = await db.add_user(
+            user_id=user.id,
+            username=user.username,
+            full_name=user.full_name
+        )
 
-    # 2️⃣ Load admins and super admins
-    admins = await db.get_all_admins()
-    super_admins = await db.get_all_super_admins()
+    # 2️⃣ Load admins (in-memory role cache, no query)
+    roles = await db.roles.fresh()
+    admin_ids = set(roles.admins)
 
     # 3️⃣ Notify admins about a new user
     if is_new:
-        for admin in admins:
-            try:
-                await bot.send_message(
-                    admin["user_id"],
-                    (
-                        "🟢 <b>New user started the bot</b>\n\n"
-                        f"👤 Name: {user.full_name}\n"
-                        f"🆔 ID: <code>{user.id}</code>\n"
-                        f"🔗 Username: @{user.username or 'none'}"
-                    ),
-                    parse_mode="HTML"
-                )
-            except Exception:
-                pass
+        await notify_new_users(bot, db, [(user.id, user.username, user.full_name)])
 
     # 4️⃣ Check roles
-    is_admin = await db.is_admin(user.id)
-    is_super_admin = await db.is_super_admin(user.id)
+    is_admin = user.id in roles.admins
+    is_super_admin = user.id in roles.super_admins
 
     # 5️⃣ ADMIN / SUPER ADMIN FLOW
     if is_admin or is_super_admin:
@@ -63,11 +78,11 @@ async def cmd_start(message: Message, bot, db):
         )
 
         # Notify other admins about admin login
-        for admin in admins:
-            if admin["user_id"] != user.id:
+        for admin_id in admin_ids:
+            if admin_id != user.id:
                 try:
                     await bot.send_message(
-                        admin["user_id"],
+                        admin_id,
                         (
                             "🔵 <b>Admin logged in</b>\n\n"
                             f"👤 Name: {user.full_name}\n"
@@ -94,10 +109,10 @@ async def cmd_start(message: Message, bot, db):
     )
 
     # 7️⃣ Notify admins about regular user login
-    for admin in admins:
+    for admin_id in admin_ids:
         try:
             await bot.send_message(
-                admin["user_id"],
+                admin_id,
                 (
                     "👤 <b>Regular user started the bot</b>\n\n"
                     f"Name: {user.full_name}\n"
@@ -149,7 +164,10 @@ async def help_command(message: Message):
    • 🔥 Supergroups only  
    • 🎯 Manual selection  
    • 🔄 Forward or 📄 Copy mode  
-   • 🖼 Photos, videos and documents supported  
+   • ⏰ Scheduled and recurring broadcasts: /schedules  
+   • 🗑 Recall or ✏️ edit a sent broadcast: /recall_ID, /edit_ID  
+   • 🔍 Find chats: type a title in the chat picker, or @bot title anywhere  
+   • 🖼 All message types and albums supported  
    • 🔐 Protected with PIN code  
 
 3️⃣ <b>Statistics</b>
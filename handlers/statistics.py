@@ -1,12 +1,50 @@
 from aiogram import Router, F
-from aiogram.types import Message
+from aiogram.filters import StateFilter
+from aiogram.types import Message, CallbackQuery
+from keyboards import main_admin_menu, pagination_keyboard
 from middlewares import AdminMiddleware
+from utils.pagination import PAGE_SIZE, parse_page, page_keys, total_pages
 import html
+from datetime import date
+from typing import List
 
 router = Router()
 router.message.middleware(AdminMiddleware())
+router.callback_query.middleware(AdminMiddleware())
+
+# Pagination prefix
+# -> (chat type, list title, empty list text)
+CHAT_LISTS = {
+    "channels": (
+        "channel",
+        "📺 <b>CHANNELS LIST</b>",
+        "📺 No channels found yet.\n\nAdd the bot as an admin to your channel."
+    ),
+    "groups": (
+        "group",
+        "👥 <b>GROUPS LIST</b>",
+        "👥 No groups found yet.\n\nAdd the bot as an admin to your group."
+    ),
+    "supergroups": (
+        "supergroup",
+        "🔥 <b>SUPERGROUPS LIST</b>",
+        "🔥 No supergroups found yet.\n\nAdd the bot as an admin to your supergroup."
+    )
+}
+
+
+def daily_chart(days: List[date], counts: list, width: int = 10) -> str:
+    """
+    Text bar chart of daily broadcast counts (oldest first).
+    """
+    peak = max(counts, default=0) or 1
+    lines = []
 
-MAX_LEN = 3900  # Safe limit (Telegram max is 4096)
+    for day, count in zip(days, counts):
+        bar = "▇" * round(count / peak * width)
+        lines.append(f"<code>{day:%m-%d}</code> {bar} {count}")
+
+    return "\n".join(lines)
 
 
 @router.message(F.text == "📊 Statistics")
@@ -14,33 +52,33 @@ async def show_statistics(message: Message, db):
     """
     Show overall bot statistics.
     """
-    chat_stats = await db.get_chat_type_counts()
-    broadcast_stats = await db.get_total_broadcast_stats()
-    admins = await db.get_all_admins()
-    time_stats = await db.get_time_based_broadcast_stats()
+    stats = await db.get_statistics()
     today_admins = await db.get_today_broadcast_admins()
 
     stats_text = f"""
 📊 <b>BOT STATISTICS</b>
 
 💬 <b>Chats:</b>
-├ 📺 Channels: <b>{chat_stats['channels']}</b>
-├ 👥 Groups: <b>{chat_stats['groups']}</b>
-├ 🔥 Supergroups: <b>{chat_stats['supergroups']}</b>
-└ 📋 Total: <b>{chat_stats['total']}</b>
+├ 📺 Channels: <b>{stats['channels']}</b>
+├ 👥 Groups: <b>{stats['groups']}</b>
+├ 🔥 Supergroups: <b>{stats['supergroups']}</b>
+└ 📋 Total: <b>{stats['total_chats']}</b>
 
 📨 <b>Broadcasts by time:</b>
-├ 📅 Today: <b>{time_stats['today']}</b>
-├ 🗓 This week: <b>{time_stats['week']}</b>
-├ 📆 This month: <b>{time_stats['month']}</b>
-└ 🧮 Total: <b>{time_stats['total']}</b>
+├ 📅 Today: <b>{stats['today']}</b>
+├ 🗓 This week: <b>{stats['week']}</b>
+├ 📆 This month: <b>{stats['month']}</b>
+└ 🧮 Total: <b>{stats['total_broadcasts']}</b>
 
 📢 <b>Broadcast results:</b>
-├ 📨 Total: <b>{broadcast_stats['total_broadcasts'] or 0}</b>
-├ ✅ Successful: <b>{broadcast_stats['total_success'] or 0}</b>
-└ ❌ Failed: <b>{broadcast_stats['total_failed'] or 0}</b>
+├ 📨 Total: <b>{stats['total_broadcasts']}</b>
+├ ✅ Successful: <b>{stats['total_success']}</b>
+└ ❌ Failed: <b>{stats['total_failed']}</b>
+
+👨‍💼 <b>Total admins:</b> <b>{stats['admins']}</b>
 
-👨‍💼 <b>Total admins:</b> <b>{len(admins)}</b>
+📈 <b>Last 7 days:</b>
+{daily_chart(stats['daily_days'], stats['daily'])}
 """
 
     # Admins who sent broadcasts today
@@ -62,78 +100,59 @@ async def show_statistics(message: Message, db):
     await message.answer(stats_text, parse_mode="HTML")
 
 
-@router.message(F.text == "📋 Channels")
-async def show_channels(message: Message, db):
+async def render_chats_page(db, prefix: str, page: int = 1, after=None, before=None):
     """
-    Show list of channels.
+    Text and navigation keyboard for one page of a chat list.
+    Returns (None, None) when the page is empty.
     """
-    channels = await db.get_chats_by_type("channel")
+    chat_type, title, _ = CHAT_LISTS[prefix]
+    chats = await db.page_chats(chat_type, after=after, before=before, limit=PAGE_SIZE)
 
-    if not channels:
-        return await message.answer(
-            "📺 No channels found yet.\n\n"
-            "Add the bot as an admin to your channel."
-        )
+    if not chats:
+        return None, None
 
-    header = "📺 <b>CHANNELS LIST</b>\n\n"
-    text = header
+    total = db.count_active_chats(chat_type)
+    text = f"{title}\n\n"
 
-    for idx, channel in enumerate(channels, 1):
-        title = html.escape(channel["title"])
-        username = f"@{html.escape(channel['username'])}" if channel["username"] else "no username"
+    for idx, chat in enumerate(chats, (page - 1) * PAGE_SIZE + 1):
+        username = f"@{html.escape(chat['username'])}" if chat["username"] else "no username"
 
-        block = (
-            f"{idx}. <b>{title}</b>\n"
-            f"   🆔 ID: <code>{channel['chat_id']}</code>\n"
+        text += (
+            f"{idx}. <b>{html.escape(chat['title'] or '')}</b>\n"
+            f"   🆔 ID: <code>{chat['chat_id']}</code>\n"
             f"   🔗 Username: {username}\n"
-            f"   📅 Added on: {channel['added_date'].strftime('%Y-%m-%d')}\n\n"
+            f"   📅 Added on: {chat['added_date'].strftime('%Y-%m-%d')}\n\n"
         )
 
-        if len(text) + len(block) > MAX_LEN:
-            await message.answer(text, parse_mode="HTML")
-            text = header
-
-        text += block
+    prev_key, next_key = page_keys(chats, "added_date", "id")
+    keyboard = pagination_keyboard(page, total_pages(total), prefix, prev_key, next_key)
 
-    if text.strip() != header.strip():
-        await message.answer(text, parse_mode="HTML")
+    return text, keyboard
 
 
-@router.message(F.text == "👥 Groups")
-async def show_groups(message: Message, db):
-    """
-    Show list of groups.
-    """
-    groups = await db.get_chats_by_type("group")
-
-    if not groups:
-        return await message.answer(
-            "👥 No groups found yet.\n\n"
-            "Add the bot as an admin to your group."
-        )
+async def show_chat_list(message: Message, db, prefix: str):
+    text, keyboard = await render_chats_page(db, prefix)
 
-    header = "👥 <b>GROUPS LIST</b>\n\n"
-    text = header
+    if not text:
+        return await message.answer(CHAT_LISTS[prefix][2])
 
-    for idx, group in enumerate(groups, 1):
-        title = html.escape(group["title"])
-        username = f"@{html.escape(group['username'])}" if group["username"] else "no username"
+    await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
-        block = (
-            f"{idx}. <b>{title}</b>\n"
-            f"   🆔 ID: <code>{group['chat_id']}</code>\n"
-            f"   🔗 Username: {username}\n"
-            f"   📅 Added on: {group['added_date'].strftime('%Y-%m-%d')}\n\n"
-        )
 
-        if len(text) + len(block) > MAX_LEN:
-            await message.answer(text, parse_mode="HTML")
-            text = header
+@router.message(F.text == "📋 Channels")
+async def show_channels(message: Message, db):
+    """
+    Show list of channels.
+    """
+    await show_chat_list(message, db, "channels")
 
-        text += block
 
-    if text.strip() != header.strip():
-        await message.answer(text, parse_mode="HTML")
+@router.message(F.text == "👥 Groups")
+async def show_groups(message: Message, db):
+    """
+    Show list of groups.
+    """
+    await show_chat_list(message, db, "groups")
 
 
 @router.message(F.text == "🔥 Supergroups")
@@ -141,33 +160,35 @@ async def show_supergroups(message: Message, db):
     """
     Show list of supergroups.
     """
-    supergroups = await db.get_chats_by_type("supergroup")
+    await show_chat_list(message, db, "supergroups")
 
-    if not supergroups:
-        return await message.answer(
-            "🔥 No supergroups found yet.\n\n"
-            "Add the bot as an admin to your supergroup."
-        )
 
-    header = "🔥 <b>SUPERGROUPS LIST</b>\n\n"
-    text = header
+@router.callback_query(F.data.regexp(r"^(channels|groups|supergroups)_page_"))
+async def chats_page(callback: CallbackQuery, db):
+    prefix = callback.data.split("_page_", 1)[0]
+    page, after, before = parse_page(callback.data)
+    text, keyboard = await render_chats_page(db, prefix, page, after, before)
 
-    for idx, group in enumerate(supergroups, 1):
-        title = html.escape(group["title"])
-        username = f"@{html.escape(group['username'])}" if group.get("username") else "no username"
+    # Rows were deleted meanwhile: start over
+    if not text:
+        text, keyboard = await render_chats_page(db, prefix)
 
-        block = (
-            f"{idx}. <b>{title}</b>\n"
-            f"   🆔 ID: <code>{group['chat_id']}</code>\n"
-            f"   🔗 Username: {username}\n"
-            f"   📅 Added on: {group['added_date'].strftime('%Y-%m-%d')}\n\n"
-        )
+    if text:
+        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+    await callback.answer()
+
+
+# ======================================================================
+# LIST NAVIGATION
+# ======================================================================
 
-        if len(text) + len(block) > MAX_LEN:
-            await message.answer(text, parse_mode="HTML")
-            text = header
+@router.callback_query(F.data == "current_page")
+async def current_page(callback: CallbackQuery):
+    await callback.answer()
 
-        text += block
 
-    if text.strip() != header.strip():
-        await message.answer(text, parse_mode="HTML")
+@router.callback_query(StateFilter(None), F.data == "back_to_menu")
+async def close_list(callback: CallbackQuery):
+    await callback.message.delete()
+    await callback.message.answer("📋 Main menu:", reply_markup=main_admin_menu())
+    await callback.answer()
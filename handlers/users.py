@@ -1,46 +1,70 @@
+import html
+
 from aiogram import Router, F
-from aiogram.types import Message
+from aiogram.types import Message, CallbackQuery
 
-router = Router()
+from keyboards import pagination_keyboard
+from middlewares import AdminMiddleware
+from utils.pagination import PAGE_SIZE, parse_page, page_keys, total_pages
 
-MAX_LEN = 3800  # Safe limit to avoid Telegram message overflow
+router = Router()
+router.message.middleware(AdminMiddleware())
+router.callback_query.middleware(AdminMiddleware())
 
 
-@router.message(F.text == "👤 Users")
-async def list_users(message: Message, db):
+async def render_users_page(db, page: int = 1, after=None, before=None):
     """
-    Display the list of all registered users.
+    Text and navigation keyboard for one page of the users list.
+    Returns (None, None) when the page is empty.
     """
-    users = await db.get_all_users()
+    users = await db.page_users(after=after, before=before, limit=PAGE_SIZE)
 
     if not users:
-        return await message.answer("❌ No users found in the database.")
+        return None, None
 
-    header = "👤 <b>Users list:</b>\n\n"
-    text = header
+    total = await db.count_users()
+    text = "👤 <b>Users list:</b>\n\n"
 
-    for idx, user in enumerate(users, 1):
+    for idx, user in enumerate(users, (page - 1) * PAGE_SIZE + 1):
         username = f"@{user['username']}" if user["username"] else "❌ no username"
 
-        line = (
-            f"{idx}. 👤 <b>{user['full_name']}</b>\n"
+        text += (
+            f"{idx}. 👤 <b>{html.escape(user['full_name'] or '')}</b>\n"
             f"🆔 <code>{user['user_id']}</code>\n"
             f"📛 {username}\n"
             f"⏱ First seen: {user['first_seen']:%Y-%m-%d %H:%M}\n\n"
         )
 
-        # Send partial message if Telegram limit is reached
-        if len(text) + len(line) > MAX_LEN:
-            await message.answer(text, parse_mode="HTML")
-            text = header
+    text += f"📊 Total users: <b>{total}</b>"
+
+    prev_key, next_key = page_keys(users, "first_seen", "user_id")
+    keyboard = pagination_keyboard(page, total_pages(total), "users", prev_key, next_key)
+
+    return text, keyboard
+
+
+@router.message(F.text == "👤 Users")
+async def list_users(message: Message, db):
+    """
+    Display the list of all registered users, one page at a time.
+    """
+    text, keyboard = await render_users_page(db)
+
+    if not text:
+        return await message.answer("❌ No users found in the database.")
+
+    await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+
 
-        text += line
+@router.callback_query(F.data.startswith("users_page_"))
+async def users_page(callback: CallbackQuery, db):
+    page, after, before = parse_page(callback.data)
+    text, keyboard = await render_users_page(db, page, after, before)
 
-    # Send remaining part
-    if text.strip() != header.strip():
-        await message.answer(text, parse_mode="HTML")
+    # Rows were deleted meanwhile: start over
+    if not text:
+        text, keyboard = await render_users_page(db)
 
-    await message.answer(
-        f"📊 Total users: <b>{len(users)}</b>",
-        parse_mode="HTML"
-    )
+    if text:
+        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+    await callback.answer()
@@ -3,6 +3,8 @@ from keyboards.admin_kb import (
     broadcast_menu,
     cancel_keyboard,
     confirm_broadcast,
+    broadcast_control_keyboard,
+    confirm_cancel_keyboard,
     chat_selection_keyboard,
     chat_type_selection_keyboard,
     admin_list_keyboard,
@@ -15,6 +17,8 @@ __all__ = [
     'broadcast_menu',
     'cancel_keyboard',
     'confirm_broadcast',
+    'broadcast_control_keyboard',
+    'confirm_cancel_keyboard',
     'chat_selection_keyboard',
     'chat_type_selection_keyboard',
     'admin_list_keyboard',
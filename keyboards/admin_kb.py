@@ -54,7 +54,7 @@ def cancel_keyboard() -> ReplyKeyboardMarkup:
     return ReplyKeyboardMarkup(keyboard=keyboard, resize_keyboard=True)
 
 
-def confirm_broadcast() -> InlineKeyboardMarkup:
+def confirm_broadcast(with_schedule: bool = True) -> InlineKeyboardMarkup:
     """
     Broadcast confirmation (send mode selection).
     """
@@ -70,28 +70,75 @@ def confirm_broadcast() -> InlineKeyboardMarkup:
                 text="📋 Copy (no forward)",
                 callback_data="send_copy"
             )
-        ],
-        [
-            InlineKeyboardButton(
-                text="❌ Cancel",
-                callback_data="cancel_broadcast"
-            )
         ]
     ]
 
+    if with_schedule:
+        keyboard.append([
+            InlineKeyboardButton(
+                text="⏰ Schedule",
+                callback_data="schedule_broadcast"
+            )
+        ])
+
+    keyboard.append([
+        InlineKeyboardButton(
+            text="❌ Cancel",
+            callback_data="cancel_broadcast"
+        )
+    ])
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def broadcast_control_keyboard(job_id: int, paused: bool = False) -> InlineKeyboardMarkup:
+    """
+    Pause / resume / cancel buttons under the broadcast progress message.
+    """
+    if paused:
+        toggle = InlineKeyboardButton(text="▶️ Resume", callback_data=f"bc_resume_{job_id}")
+    else:
+        toggle = InlineKeyboardButton(text="⏸ Pause", callback_data=f"bc_pause_{job_id}")
+
+    keyboard = [[
+        toggle,
+        InlineKeyboardButton(text="⛔ Cancel", callback_data=f"bc_cancel_{job_id}")
+    ]]
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def confirm_cancel_keyboard(job_id: int) -> InlineKeyboardMarkup:
+    """
+    Confirmation before a running broadcast is cancelled.
+    """
+    keyboard = [[
+        InlineKeyboardButton(text="✅ Yes, cancel", callback_data=f"bc_cancel_yes_{job_id}"),
+        InlineKeyboardButton(text="🔙 No", callback_data=f"bc_cancel_no_{job_id}")
+    ]]
+
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
 def chat_selection_keyboard(
     chats: list,
-    selected_ids: list | None = None,
-    chat_type: str = "all"
+    selected_ids: set | None = None,
+    selected_count: int | None = None,
+    page: int = 1,
+    total_pages: int = 1,
+    prev_key: str | None = None,
+    next_key: str | None = None,
+    search: bool = False
 ) -> InlineKeyboardMarkup:
     """
-    Chat selection keyboard (checkbox-style).
+    Chat selection keyboard (checkbox-style), one page of chats
+    or search results (`search`).
+    `selected_ids` only needs the selected chats of this page.
     """
     if selected_ids is None:
-        selected_ids = []
+        selected_ids = set()
+    if selected_count is None:
+        selected_count = len(selected_ids)
 
     keyboard = []
 
@@ -109,12 +156,28 @@ def chat_selection_keyboard(
             )
         ])
 
+    if search:
+        keyboard.append([
+            InlineKeyboardButton(text="🔙 All chats", callback_data="pick_page_1")
+        ])
+    elif total_pages > 1:
+        # Navigation row only, without the Back row
+        keyboard.append(
+            pagination_keyboard(page, total_pages, "pick", prev_key, next_key).inline_keyboard[0]
+        )
+
+    keyboard.append([
+        InlineKeyboardButton(text="☑️ Page", callback_data="pick_on_page"),
+        InlineKeyboardButton(text="✅ All", callback_data="pick_all"),
+        InlineKeyboardButton(text="🔄 Invert", callback_data="pick_invert")
+    ])
+
     bottom_buttons = []
 
-    if selected_ids:
+    if selected_count:
         bottom_buttons.append(
             InlineKeyboardButton(
-                text=f"✅ Send ({len(selected_ids)})",
+                text=f"✅ Send ({selected_count})",
                 callback_data="confirm_selected"
             )
         )
@@ -126,8 +189,7 @@ def chat_selection_keyboard(
         )
     )
 
-    if bottom_buttons:
-        keyboard.append(bottom_buttons)
+    keyboard.append(bottom_buttons)
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
@@ -176,10 +238,20 @@ def admin_list_keyboard(admins: list) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
-def pagination_keyboard(page: int, total_pages: int, prefix: str) -> InlineKeyboardMarkup:
+def pagination_keyboard(
+    page: int,
+    total_pages: int,
+    prefix: str,
+    prev_key: str | None = None,
+    next_key: str | None = None
+) -> InlineKeyboardMarkup:
     """
     Pagination navigation keyboard.
+    Optional keyset cursors are appended to the page callbacks.
     """
+    prev_suffix = f"_{prev_key}" if prev_key else ""
+    next_suffix = f"_{next_key}" if next_key else ""
+
     keyboard = []
 
     nav_buttons = []
@@ -188,7 +260,7 @@ def pagination_keyboard(page: int, total_pages: int, prefix: str) -> InlineKeybo
         nav_buttons.append(
             InlineKeyboardButton(
                 text="⬅️ Previous",
-                callback_data=f"{prefix}_page_{page - 1}"
+                callback_data=f"{prefix}_page_{page - 1}{prev_suffix}"
             )
         )
 
@@ -203,7 +275,7 @@ def pagination_keyboard(page: int, total_pages: int, prefix: str) -> InlineKeybo
         nav_buttons.append(
             InlineKeyboardButton(
                 text="Next ➡️",
-                callback_data=f"{prefix}_page_{page + 1}"
+                callback_data=f"{prefix}_page_{page + 1}{next_suffix}"
             )
         )
 
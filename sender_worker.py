@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+
+import config
+from database import init_db, close_db
+from utils.jobs import PROCESS_ID, deliver_job_chats, notify_job_finished
+
+# =====================
+# LOGGING CONFIGURATION
+# =====================
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def process_batch(bot: Bot, db, batch: list):
+    """
+    Deliver one claimed batch, job by job, then finish completed jobs.
+    """
+    chats_by_job = defaultdict(list)
+    for row in batch:
+        chats_by_job[row["job_id"]].append(row["chat_id"])
+
+    for job_id, chat_ids in chats_by_job.items():
+        job = await db.get_broadcast_job(job_id)
+        await deliver_job_chats(bot, db, job, chat_ids)
+
+        finished = await db.finish_broadcast_job(job_id)
+        if finished:
+            logger.info(f"✅ Broadcast job #{job_id} finished")
+            await notify_job_finished(bot, finished)
+
+
+async def main():
+    """
+    Sender worker entry point.
+    Claims delivery batches from PostgreSQL and sends them.
+    Any number of workers (on any number of machines) can run at once.
+    """
+    bot = Bot(
+        token=config.BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+    )
+    db = await init_db()
+
+    worker_id = PROCESS_ID
+    last_cleanup = 0.0
+
+    logger.info(f"📤 Sender worker {worker_id} is starting...")
+
+    try:
+        while True:
+            if time.monotonic() - last_cleanup > config.SENDER_CLAIM_TIMEOUT / 2:
+                await db.release_stale_claims(config.SENDER_CLAIM_TIMEOUT)
+                last_cleanup = time.monotonic()
+
+            batch = await db.claim_deliveries(worker_id, config.SENDER_BATCH_SIZE)
+
+            if not batch:
+                await asyncio.sleep(config.SENDER_POLL_INTERVAL)
+                continue
+
+            await process_batch(bot, db, batch)
+
+    finally:
+        await close_db()
+        await bot.session.close()
+        logger.info(f"👋 Sender worker {worker_id} has been stopped")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("👋 Sender worker stopped manually (KeyboardInterrupt)")
+    except Exception as e:
+        logger.error(f"❌ Sender worker crashed with error: {e}")
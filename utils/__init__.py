@@ -1,10 +1,24 @@
 from utils.states import BroadcastStates, AdminStates
 from utils.broadcast import broadcast_message, broadcast_to_selected, send_message_to_chat
+from utils.progress import BroadcastProgress
+from utils.jobs import (
+    start_broadcast_job,
+    run_broadcast_job,
+    enqueue_broadcast_job,
+    resume_unfinished_jobs,
+    message_ref
+)
 
 __all__ = [
     'BroadcastStates',
     'AdminStates',
     'broadcast_message',
     'broadcast_to_selected',
-    'send_message_to_chat'
+    'send_message_to_chat',
+    'BroadcastProgress',
+    'start_broadcast_job',
+    'run_broadcast_job',
+    'enqueue_broadcast_job',
+    'resume_unfinished_jobs',
+    'message_ref'
 ]
@@ -1,59 +1,356 @@
 import asyncio
-from typing import List, Dict
+import heapq
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Set, Tuple
 from aiogram import Bot
+from aiogram.methods import (
+    TelegramMethod,
+    CopyMessage,
+    CopyMessages,
+    ForwardMessage,
+    ForwardMessages
+)
 from aiogram.types import Message
-from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest
+
+import config
+from utils.control import BroadcastControl
+from utils.payload import PreparedRequest
+from utils.rate_limit import global_limiter, chat_limiter, dispatcher
+from utils.retry import (
+    FLOOD,
+    TRANSIENT,
+    MIGRATE,
+    classify_error,
+    backoff_delay
+)
+
+logger = logging.getLogger(__name__)
 
 
 async def send_copy(bot: Bot, chat_id: int, msg: Message):
     """
     Send a message as a COPY (without forwarding metadata).
-    Supports text, photo, video and document.
+    A single copyMessage call covers every message type
+    (text, media, voice, stickers, polls...) and keeps entities.
+    """
+    return await bot.copy_message(
+        chat_id=chat_id,
+        from_chat_id=msg.chat.id,
+        message_id=msg.message_id
+    )
+
+
+async def send_forward(bot: Bot, chat_id: int, msg: Message):
     """
+    Send a message using Telegram FORWARD (keeps original metadata).
+    """
+    return await bot.forward_message(
+        chat_id=chat_id,
+        from_chat_id=msg.chat.id,
+        message_id=msg.message_id
+    )
+
 
-    if msg.photo:
-        return await bot.send_photo(
+def build_send_method(
+    from_chat_id: int,
+    message_id: int,
+    send_mode: str,
+    album_message_ids: List[int] | None = None,
+    chat_id: int = 0
+) -> TelegramMethod:
+    """
+    Build the API method that delivers a stored message (or album).
+    Albums are sent as one media group with copyMessages / forwardMessages.
+    """
+    if album_message_ids:
+        method = ForwardMessages if send_mode == "forward" else CopyMessages
+        return method(
             chat_id=chat_id,
-            photo=msg.photo[-1].file_id,
-            caption=msg.caption or "",
-            parse_mode="HTML"
+            from_chat_id=from_chat_id,
+            message_ids=sorted(album_message_ids)
         )
 
-    if msg.video:
-        return await bot.send_video(
-            chat_id=chat_id,
-            video=msg.video.file_id,
-            caption=msg.caption or "",
-            parse_mode="HTML"
+    method = ForwardMessage if send_mode == "forward" else CopyMessage
+    return method(
+        chat_id=chat_id,
+        from_chat_id=from_chat_id,
+        message_id=message_id
+    )
+
+
+def prepare_broadcast_request(
+    bot: Bot,
+    message: Message,
+    send_mode: str,
+    album_group: List[Message] | None = None
+) -> PreparedRequest:
+    """
+    Serialize the broadcast request once for all recipients.
+    """
+    album_message_ids = None
+    if album_group and len(album_group) > 1:
+        album_message_ids = [m.message_id for m in album_group]
+
+    return PreparedRequest(
+        bot,
+        build_send_method(
+            message.chat.id,
+            message.message_id,
+            send_mode,
+            album_message_ids
         )
+    )
 
-    if msg.document:
-        return await bot.send_document(
-            chat_id=chat_id,
-            document=msg.document.file_id,
-            caption=msg.caption or "",
-            parse_mode="HTML"
+
+async def send_by_reference(
+    bot: Bot,
+    chat_id: int,
+    from_chat_id: int,
+    message_id: int,
+    send_mode: str,
+    album_message_ids: List[int] | None = None
+):
+    """
+    Send a stored message by (chat id, message id) reference.
+    """
+    return await bot(
+        build_send_method(
+            from_chat_id,
+            message_id,
+            send_mode,
+            album_message_ids,
+            chat_id=chat_id
         )
+    )
 
-    if msg.text:
-        return await bot.send_message(
-            chat_id=chat_id,
-            text=msg.text,
-            parse_mode="HTML"
+
+async def send_once(
+    bot: Bot,
+    chat_id: int,
+    message: Message,
+    send_mode: str,
+    album_group: List[Message] | None = None
+):
+    """
+    Send one message (or one album) without any rate limiting
+    or error handling.
+    """
+    if album_group and len(album_group) > 1:
+        return await send_by_reference(
+            bot,
+            chat_id,
+            message.chat.id,
+            message.message_id,
+            send_mode,
+            album_message_ids=[m.message_id for m in album_group]
         )
 
-    return None
+    if send_mode == "forward":
+        return await send_forward(bot, chat_id, message)
 
+    return await send_copy(bot, chat_id, message)
 
-async def send_forward(bot: Bot, chat_id: int, msg: Message):
+
+class DeliveryQueue:
     """
-    Send a message using Telegram FORWARD (keeps original metadata).
+    Work queue of (chat_id, attempt) pairs shared by all senders.
+    Transient failures are parked in a delayed heap until their
+    backoff expires, so they never block fresh chats.
     """
-    return await bot.forward_message(
-        chat_id=chat_id,
-        from_chat_id=msg.chat.id,
-        message_id=msg.message_id
-    )
+
+    def __init__(self, chat_ids: Iterable[int]):
+        self._pending = deque((chat_id, 1) for chat_id in chat_ids)
+        self._delayed: List[Tuple[float, int, int, int]] = []
+        self._seq = 0
+        self._in_flight = 0
+        self._changed = asyncio.Event()
+
+    async def get(self) -> Tuple[int, int] | None:
+        """
+        Return the next (chat_id, attempt) or None when all work is done.
+        """
+        while True:
+            now = time.monotonic()
+
+            if self._delayed and self._delayed[0][0] <= now:
+                _, _, chat_id, attempt = heapq.heappop(self._delayed)
+                self._in_flight += 1
+                return chat_id, attempt
+
+            if self._pending:
+                self._in_flight += 1
+                return self._pending.popleft()
+
+            if not self._delayed and not self._in_flight:
+                return None
+
+            timeout = self._delayed[0][0] - now if self._delayed else None
+            self._changed.clear()
+
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def retry_now(self, chat_id: int, attempt: int):
+        self._pending.appendleft((chat_id, attempt))
+
+    def retry_later(self, chat_id: int, attempt: int, delay: float):
+        self._seq += 1
+        heapq.heappush(
+            self._delayed,
+            (time.monotonic() + delay, self._seq, chat_id, attempt)
+        )
+
+    def task_done(self):
+        self._in_flight -= 1
+        self._changed.set()
+
+    def close(self):
+        """Drop all remaining work (broadcast cancelled)."""
+        self._pending.clear()
+        self._delayed.clear()
+        self._changed.set()
+
+
+class DeliveryEngine:
+    """
+    Rate-limited concurrent delivery engine.
+
+    `send(chat_id)` performs one API call and raises on error.
+    `on_result(chat_id, ok, result)` is called once per chat with the
+    final outcome (API result on success, the exception on failure).
+    `on_progress(stats)` is called after every final outcome with the
+    live {"total", "success", "failed"} counters.
+    `control` (BroadcastControl) pauses the senders or cancels the run;
+    cancelled chats are neither sent nor reported.
+    `before_send(chat_id)` is awaited once per chat right before its
+    first API call; returning False skips the chat (already delivered).
+    Sends are granted by the process-wide dispatcher: `flow` identifies
+    this run (a job id) and `weight` is its share of the rate budget;
+    `priority` runs use the priority lane instead.
+    Errors are sorted by kind:
+      - flood-wait → the shared limiter is paused for `retry_after`
+      - transient  → the chat goes to the delayed retry queue
+      - migrate    → the send is repeated to the new supergroup id
+      - permanent  → the chat is counted as failed
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int], Awaitable[Any]],
+        concurrency: int | None = None,
+        max_attempts: int | None = None,
+        on_result: Callable[[int, bool, Any], None] | None = None,
+        on_progress: Callable[[Dict[str, int]], None] | None = None,
+        control: BroadcastControl | None = None,
+        before_send: Callable[[int], Awaitable[bool]] | None = None,
+        flow: Hashable | None = None,
+        weight: int = 1,
+        priority: bool = False
+    ):
+        self.send = send
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.control = control
+        self.before_send = before_send
+        self.flow = self if flow is None else flow
+        self.weight = weight
+        self.priority = priority
+        self.concurrency = concurrency or config.BROADCAST_CONCURRENCY
+        self.max_attempts = max_attempts or config.BROADCAST_MAX_ATTEMPTS
+
+        self.stats = {"total": 0, "success": 0, "failed": 0}
+        self.migrated: Dict[int, int] = {}
+        self._started: Set[int] = set()
+
+    async def run(self, chat_ids: Iterable[int]) -> Dict[str, int]:
+        # A chat listed twice must still get one message
+        chat_ids = list(dict.fromkeys(chat_ids))
+        self.stats["total"] = len(chat_ids)
+
+        queue = DeliveryQueue(chat_ids)
+        if self.control:
+            self.control.add_cancel_callback(queue.close)
+
+        workers = min(self.concurrency, len(chat_ids))
+        dispatcher.set_weight(self.flow, self.weight)
+        try:
+            await asyncio.gather(*(self._sender(queue) for _ in range(workers)))
+        finally:
+            dispatcher.remove_flow(self.flow)
+
+        return self.stats
+
+    async def _sender(self, queue: DeliveryQueue):
+        while (item := await queue.get()) is not None:
+            chat_id, attempt = item
+            try:
+                await self._deliver(queue, chat_id, attempt)
+            finally:
+                queue.task_done()
+
+    def _finish(self, chat_id: int, ok: bool, result: Any):
+        self.stats["success" if ok else "failed"] += 1
+
+        if self.on_result:
+            self.on_result(chat_id, ok, result)
+
+        if self.on_progress:
+            self.on_progress(self.stats)
+
+    def _skip(self):
+        self.stats["total"] -= 1
+
+        if self.on_progress:
+            self.on_progress(self.stats)
+
+    async def _deliver(self, queue: DeliveryQueue, chat_id: int, attempt: int):
+        target_id = self.migrated.get(chat_id, chat_id)
+
+        if self.control and not await self.control.wait():
+            return
+
+        await chat_limiter.acquire(target_id)
+        await dispatcher.acquire(self.flow, self.priority)
+
+        # Paused or cancelled while waiting for the limiter
+        if self.control and not await self.control.wait():
+            return
+
+        try:
+            if self.before_send and chat_id not in self._started:
+                if not await self.before_send(chat_id):
+                    self._skip()
+                    return
+                self._started.add(chat_id)
+
+            result = await self.send(target_id)
+            self._finish(chat_id, True, result)
+            return
+
+        except Exception as e:
+            kind = classify_error(e)
+            error = e
+
+        if kind == MIGRATE:
+            self.migrated[chat_id] = error.migrate_to_chat_id
+            queue.retry_now(chat_id, attempt)
+            return
+
+        if attempt >= self.max_attempts or kind not in (FLOOD, TRANSIENT):
+            logger.debug(f"Delivery to {chat_id} failed ({kind}): {error}")
+            self._finish(chat_id, False, error)
+            return
+
+        if kind == FLOOD:
+            logger.warning(f"Flood-wait {error.retry_after}s while sending to {chat_id}")
+            global_limiter.pause(error.retry_after)
+            queue.retry_now(chat_id, attempt + 1)
+        else:
+            queue.retry_later(chat_id, attempt + 1, backoff_delay(attempt))
 
 
 async def send_message_to_chat(
@@ -65,29 +362,15 @@ async def send_message_to_chat(
 ) -> bool:
     """
     Universal message sender.
+    Goes through the delivery engine, so rate limits and retries apply.
     Returns True if the message was sent successfully, otherwise False.
     """
 
-    try:
-        # ❌ Media groups (albums) are not supported
-        if album_group and len(album_group) > 1:
-            return False
-
-        # 1) Force FORWARD mode
-        if send_mode == "forward":
-            await send_forward(bot, chat_id, message)
-            return True
-
-        # 2) Default COPY mode
-        await send_copy(bot, chat_id, message)
-        return True
-
-    except (TelegramForbiddenError, TelegramBadRequest):
-        # Bot has no permission or chat is unavailable
-        return False
-
-    except Exception as e:
-        return False
+    engine = DeliveryEngine(
+        lambda target_id: send_once(bot, target_id, message, send_mode, album_group)
+    )
+    stats = await engine.run([chat_id])
+    return stats["success"] == 1
 
 
 async def broadcast_message(
@@ -102,31 +385,10 @@ async def broadcast_message(
     Returns statistics about success and failure counts.
     """
 
-    success = 0
-    failed = 0
+    prepared = prepare_broadcast_request(bot, message, send_mode, album_group)
 
-    for chat in chats:
-        chat_id = chat["chat_id"]
-
-        if await send_message_to_chat(
-            bot=bot,
-            chat_id=chat_id,
-            message=message,
-            send_mode=send_mode,
-            album_group=album_group
-        ):
-            success += 1
-        else:
-            failed += 1
-
-        # Rate limiting to avoid Telegram flood limits
-        await asyncio.sleep(0.05)
-
-    return {
-        "total": len(chats),
-        "success": success,
-        "failed": failed
-    }
+    engine = DeliveryEngine(prepared.send)
+    return await engine.run(chat["chat_id"] for chat in chats)
 
 
 async def broadcast_to_selected(
@@ -139,24 +401,7 @@ async def broadcast_to_selected(
     Send a message to a specific list of chat IDs.
     """
 
-    success = 0
-    failed = 0
-
-    for chat_id in chat_ids:
-        if await send_message_to_chat(
-            bot=bot,
-            chat_id=chat_id,
-            message=message,
-            album_group=album_group
-        ):
-            success += 1
-        else:
-            failed += 1
-
-        await asyncio.sleep(0.05)
+    prepared = prepare_broadcast_request(bot, message, "copy", album_group)
 
-    return {
-        "total": len(chat_ids),
-        "success": success,
-        "failed": failed
-    }
+    engine = DeliveryEngine(prepared.send)
+    return await engine.run(chat_ids)
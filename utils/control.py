@@ -0,0 +1,61 @@
+import asyncio
+from typing import Callable, Dict, List
+
+
+class BroadcastControl:
+    """
+    Control channel of one running broadcast (pause / resume / cancel).
+    Senders call `wait()` before every send: it blocks while paused
+    and returns False once the broadcast is cancelled.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.cancelled = False
+
+        self._running = asyncio.Event()
+        self._running.set()
+        self._on_cancel: List[Callable[[], None]] = []
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self._running.set()
+
+        for callback in self._on_cancel:
+            callback()
+
+    def add_cancel_callback(self, callback: Callable[[], None]):
+        self._on_cancel.append(callback)
+
+    async def wait(self) -> bool:
+        await self._running.wait()
+        return not self.cancelled
+
+
+# Running broadcasts of this process: { job_id: control }
+_controls: Dict[int, BroadcastControl] = {}
+
+
+def register_control(job_id: int) -> BroadcastControl:
+    control = BroadcastControl(job_id)
+    _controls[job_id] = control
+    return control
+
+
+def unregister_control(job_id: int):
+    _controls.pop(job_id, None)
+
+
+def get_control(job_id: int) -> BroadcastControl | None:
+    return _controls.get(job_id)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import List, Set
+
+# (min, max) for: minute, hour, day of month, month, day of week
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError("step must be positive")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = end = int(part)
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"value out of range {low}-{high}")
+
+        values.update(range(start, end + 1, step))
+
+    return values
+
+
+class CronRule:
+    """
+    Minimal 5-field cron rule: "minute hour day month weekday".
+    Supports *, numbers, lists (1,3), ranges (1-5) and steps (*/15).
+    Weekday: 0 = Sunday ... 6 = Saturday.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError("cron rule must have 5 fields")
+
+        parsed: List[Set[int]] = [
+            _parse_field(field, low, high)
+            for field, (low, high) in zip(fields, _FIELD_RANGES)
+        ]
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+
+        # Standard cron: if both are restricted, either one may match
+        if not self._any_day and not self._any_weekday:
+            return day_ok or weekday_ok
+
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first matching minute strictly after `after`."""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+
+        while moment < limit:
+            if moment.month not in self.months:
+                year = moment.year + moment.month // 12
+                moment = moment.replace(year=year, month=moment.month % 12 + 1, day=1, hour=0, minute=0)
+                continue
+
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+
+            return moment
+
+        raise ValueError(f"cron rule never matches: {self.expression}")
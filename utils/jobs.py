@@ -0,0 +1,452 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from aiogram import Bot
+from aiogram.types import Message
+
+import config
+from utils.broadcast import DeliveryEngine, build_send_method
+from utils.control import BroadcastControl, register_control, unregister_control
+from utils.payload import PreparedRequest, result_message_ids
+from utils.retry import is_chat_not_found, is_dead_chat_error
+
+logger = logging.getLogger(__name__)
+
+# Owner of the deliveries this process sends (claimed_by); the start
+# time tells a restarted process from its previous run
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{int(time.time())}"
+
+# Keeps references to background jobs so they are not garbage collected
+_background_jobs: Set[asyncio.Task] = set()
+
+# Broadcast target → chat type
+TARGET_CHAT_TYPES = {
+    "channels": "channel",
+    "groups": "group",
+    "supergroups": "supergroup"
+}
+
+
+def get_target_chat_ids(db, target: str) -> List[int]:
+    """
+    Ids of active chats for a broadcast target ("all", "channels", ...),
+    from the in-memory chat registry.
+    """
+    return db.get_active_chat_ids(TARGET_CHAT_TYPES.get(target))
+
+
+def run_in_background(coro) -> asyncio.Task:
+    """
+    Run a job coroutine as a background task and keep a reference to it.
+    """
+    task = asyncio.create_task(coro)
+    _background_jobs.add(task)
+    task.add_done_callback(_background_jobs.discard)
+    return task
+
+
+class DeliveryCheckpoint:
+    """
+    Journal of a job's deliveries in the database.
+
+    The intent to send is recorded before the API call, but not per
+    send: the next `intent_batch` chats of `chat_ids` (in sending
+    order) are marked 'sending' in one UPDATE, and `begin(chat_id)`
+    is a set lookup until the chunk runs out. The chunk is one chat
+    per concurrent sender, so a crash leaves no more chats unconfirmed
+    than there can be sends in flight. Results are buffered and
+    written in batches (every `batch_size` results or every `interval`
+    seconds). Deliveries in flight get a heartbeat, so other processes
+    don't take them for leftovers of a crash.
+    """
+
+    def __init__(
+        self,
+        db,
+        job_id: int,
+        chat_ids: Iterable[int] = (),
+        batch_size: int | None = None,
+        interval: float | None = None,
+        intent_batch: int | None = None
+    ):
+        self.db = db
+        self.job_id = job_id
+        self.batch_size = batch_size or config.BROADCAST_CHECKPOINT_BATCH
+        self.interval = interval or config.BROADCAST_CHECKPOINT_INTERVAL
+        self.intent_batch = intent_batch or config.BROADCAST_CONCURRENCY
+
+        self._buffer: List[Tuple[int, str, List[int] | None]] = []
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+        # Sending order, claimed from `_next` on
+        self._order = list(dict.fromkeys(chat_ids))
+        self._next = 0
+        self._claim_lock = asyncio.Lock()
+        # Marked 'sending' by us, not begun yet
+        self._claimed: Set[int] = set()
+        # Refused by the database: delivered or in flight elsewhere
+        self._refused: Set[int] = set()
+
+        # Begun, no result yet
+        self._in_flight: Set[int] = set()
+        self._heartbeat_at = time.monotonic()
+
+    async def begin(self, chat_id: int) -> bool:
+        """
+        Mark the delivery as in flight. Returns False if the chat was
+        already delivered (or is being sent by another worker).
+        Only the first chat of each chunk waits for the database.
+        """
+        if chat_id not in self._claimed:
+            async with self._claim_lock:
+                while self._undecided(chat_id) and self._next < len(self._order):
+                    chunk = self._order[self._next:self._next + self.intent_batch]
+                    self._next += len(chunk)
+                    await self._claim(chunk)
+
+                # Not in the planned order: claim it alone
+                if self._undecided(chat_id):
+                    await self._claim([chat_id])
+
+        if chat_id not in self._claimed:
+            return False
+
+        self._claimed.discard(chat_id)
+        self._in_flight.add(chat_id)
+        return True
+
+    def _undecided(self, chat_id: int) -> bool:
+        return chat_id not in self._claimed and chat_id not in self._refused
+
+    async def _claim(self, chat_ids: List[int]):
+        started = set(await self.db.begin_deliveries(self.job_id, chat_ids, PROCESS_ID))
+        self._claimed |= started
+        self._refused.update(chat_id for chat_id in chat_ids if chat_id not in started)
+
+    def add(self, chat_id: int, ok: bool, result: Any = None):
+        self._in_flight.discard(chat_id)
+
+        if ok:
+            self._buffer.append((chat_id, "sent", result_message_ids(result)))
+        else:
+            self._buffer.append((chat_id, "failed", None))
+
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, []
+            chat_ids, statuses, message_ids = map(list, zip(*batch))
+
+            try:
+                await self.db.save_delivery_results(
+                    self.job_id, chat_ids, statuses, message_ids
+                )
+            except Exception as e:
+                logger.error(f"Failed to checkpoint job {self.job_id}: {e}")
+                self._buffer = batch + self._buffer
+
+    async def _flusher(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._full.clear()
+            await self.flush()
+            await self._heartbeat()
+
+    async def _heartbeat(self):
+        now = time.monotonic()
+        owned = self._in_flight | self._claimed
+        if not owned or now - self._heartbeat_at < config.SENDER_CLAIM_TIMEOUT / 3:
+            return
+
+        self._heartbeat_at = now
+        try:
+            await self.db.touch_deliveries(self.job_id, list(owned))
+        except Exception as e:
+            logger.error(f"Failed to refresh deliveries of job {self.job_id}: {e}")
+
+    async def __aenter__(self):
+        self._closed = False
+        self._task = asyncio.create_task(self._flusher())
+        return self
+
+    async def __aexit__(self, *exc):
+        # Let the flusher finish its current write instead of cancelling it
+        self._closed = True
+        self._full.set()
+        await self._task
+
+        await self.flush()
+
+        # Retries dropped by a cancel: attempted, outcome unknown;
+        # intents claimed ahead but never sent go back to the queue
+        in_flight, self._in_flight = list(self._in_flight), set()
+        unsent, self._claimed = list(self._claimed), set()
+        try:
+            if in_flight:
+                await self.db.mark_deliveries(self.job_id, in_flight, "unconfirmed")
+            if unsent:
+                await self.db.release_deliveries(self.job_id, unsent)
+        except Exception as e:
+            logger.error(f"Failed to finalize deliveries of job {self.job_id}: {e}")
+
+
+class ChatCleanup:
+    """
+    Collects chats found dead during a broadcast and group → supergroup
+    migrations, then writes them to `chats` in bulk so the next
+    broadcast skips them.
+
+    "Chat not found" may be about the source chat rather than the
+    target, so those chats are only deactivated if the errors didn't
+    come as a long run (an unreadable source fails every send).
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.dead_chat_ids: List[int] = []
+        self.not_found_ids: List[int] = []
+        self.source_unreadable = False
+        self._streak = 0
+
+    def add(self, chat_id: int, ok: bool, result: Any = None):
+        if not ok and is_chat_not_found(result):
+            self.not_found_ids.append(chat_id)
+            self._streak += 1
+            if self._streak >= config.BROADCAST_NOT_FOUND_STREAK:
+                self.source_unreadable = True
+            return
+
+        self._streak = 0
+        if not ok and is_dead_chat_error(result):
+            self.dead_chat_ids.append(chat_id)
+
+    async def flush(self, migrated: Dict[int, int]):
+        if self.source_unreadable:
+            logger.warning(
+                f"⚠️ {len(self.not_found_ids)} sends failed with 'chat not found', "
+                f"the source message looks unreadable; chats kept active"
+            )
+        else:
+            self.dead_chat_ids += self.not_found_ids
+
+        try:
+            if self.dead_chat_ids:
+                await self.db.deactivate_chats(self.dead_chat_ids)
+                logger.info(f"🧹 Deactivated {len(self.dead_chat_ids)} dead chats")
+
+            if migrated:
+                await self.db.migrate_chats(list(migrated), list(migrated.values()))
+                logger.info(f"🔁 Migrated {len(migrated)} groups to supergroups")
+        except Exception as e:
+            logger.error(f"Failed to clean up chats: {e}")
+
+        self.dead_chat_ids = []
+        self.not_found_ids = []
+        self.source_unreadable = False
+        self._streak = 0
+
+
+async def deliver_job_chats(
+    bot: Bot,
+    db,
+    job: Dict,
+    chat_ids: List[int],
+    on_progress: Callable[[Dict[str, int]], None] | None = None,
+    control: BroadcastControl | None = None
+):
+    """
+    Deliver a job to the given chats and checkpoint the results.
+    The source message (or album) is sent by reference, so the same
+    code serves fresh, resumed and sender-worker deliveries.
+    """
+    # Serialized once, only chat_id changes per send
+    prepared = PreparedRequest(
+        bot,
+        build_send_method(
+            job["source_chat_id"],
+            job["source_message_id"],
+            job["send_mode"],
+            job["album_message_ids"]
+        )
+    )
+
+    checkpoint = DeliveryCheckpoint(db, job["id"], chat_ids)
+    cleanup = ChatCleanup(db)
+
+    def on_result(chat_id: int, ok: bool, result: Any):
+        checkpoint.add(chat_id, ok, result)
+        cleanup.add(chat_id, ok, result)
+
+    engine = DeliveryEngine(
+        prepared.send,
+        on_result=on_result,
+        on_progress=on_progress,
+        control=control,
+        before_send=checkpoint.begin,
+        flow=job["id"]
+    )
+
+    async with checkpoint:
+        await engine.run(chat_ids)
+
+    await cleanup.flush(engine.migrated)
+
+
+async def run_broadcast_job(
+    bot: Bot,
+    db,
+    job_id: int,
+    on_progress: Callable[[Dict[str, int]], None] | None = None,
+    control: BroadcastControl | None = None
+) -> Dict[str, int]:
+    """
+    Deliver all pending chats of a job in this process and finish it.
+    Every run gets a control channel (pause / resume / cancel).
+    """
+    job = await db.get_broadcast_job(job_id)
+    chat_ids = await db.get_pending_deliveries(job_id)
+
+    control = control or register_control(job_id)
+
+    try:
+        await deliver_job_chats(bot, db, job, chat_ids, on_progress, control)
+    finally:
+        unregister_control(job_id)
+
+    if control.cancelled:
+        job = await db.cancel_broadcast_job(job_id)
+    else:
+        job = await db.finish_broadcast_job(job_id) or await db.get_broadcast_job(job_id)
+
+    return {
+        "total": job["total"],
+        "success": job["success"],
+        "failed": job["failed"]
+    }
+
+
+def message_ref(message: Message, album_group: List[Message] | None = None) -> Dict:
+    """
+    What a broadcast needs to know about its source message (or album).
+    Plain JSON-able values, small enough to keep in FSM data.
+    """
+    ref = {
+        "source_chat_id": message.chat.id,
+        "source_message_id": message.message_id,
+        "album_message_ids": None,
+        "message_type": message.content_type,
+        "message_text": message.text or message.caption
+    }
+
+    if album_group and len(album_group) > 1:
+        ref["album_message_ids"] = sorted(m.message_id for m in album_group)
+        ref["message_type"] = "media_group"
+
+    return ref
+
+
+async def enqueue_broadcast_job(
+    db,
+    admin_id: int,
+    chat_ids: List[int],
+    source: Dict,
+    send_mode: str = "copy",
+    delivery_mode: str = "local"
+) -> int:
+    """
+    Persist a new broadcast job with all its deliveries pending.
+    `source` is a message_ref(). Returns the job id.
+    'external' jobs are left to sender workers.
+    """
+    return await db.create_broadcast_job(
+        admin_id=admin_id,
+        send_mode=send_mode,
+        chat_ids=chat_ids,
+        delivery_mode=delivery_mode,
+        **source
+    )
+
+
+async def start_broadcast_job(
+    bot: Bot,
+    db,
+    admin_id: int,
+    chat_ids: List[int],
+    message: Message,
+    send_mode: str = "copy",
+    album_group: List[Message] | None = None,
+    on_progress: Callable[[Dict[str, int]], None] | None = None
+) -> Dict[str, int]:
+    """
+    Persist a new broadcast job and deliver it in this process.
+    """
+    job_id = await enqueue_broadcast_job(
+        db, admin_id, chat_ids, message_ref(message, album_group), send_mode
+    )
+    return await run_broadcast_job(bot, db, job_id, on_progress)
+
+
+async def notify_job_finished(bot: Bot, job: Dict):
+    """
+    Tell the admin who started the broadcast that it is finished.
+    """
+    try:
+        await bot.send_message(
+            job["admin_id"],
+            f"✅ <b>Broadcast #{job['id']} finished!</b>\n\n"
+            f"📋 Total: <b>{job['total']}</b>\n"
+            f"✅ Successful: <b>{job['success']}</b>\n"
+            f"❌ Failed: <b>{job['failed']}</b>\n\n"
+            f"🗑 Recall: /recall_{job['id']}\n"
+            f"✏️ Edit: /edit_{job['id']}",
+            parse_mode="HTML"
+        )
+    except Exception as e:
+        logger.warning(f"Failed to notify admin {job['admin_id']}: {e}")
+
+
+async def resume_unfinished_jobs(bot: Bot, db) -> int:
+    """
+    Resume jobs interrupted by a restart, starting from
+    their first undelivered chat. Paused jobs stay paused until an
+    admin resumes or cancels them. Returns the number of resumed jobs.
+    """
+    jobs = await db.get_unfinished_broadcast_jobs()
+
+    for job in jobs:
+        logger.info(f"♻️ Resuming broadcast job #{job['id']} ({job['status']})")
+        # Sends cut off by the restart may have reached the chat
+        await db.mark_unconfirmed(job["id"], PROCESS_ID)
+
+        control = register_control(job["id"])
+        if job["status"] == "paused":
+            control.pause()
+
+        run_in_background(_resume_job(bot, db, job["id"], control))
+
+    return len(jobs)
+
+
+async def _resume_job(bot: Bot, db, job_id: int, control: BroadcastControl):
+    # Nobody watches the progress of a resumed job: the result goes to its admin
+    await run_broadcast_job(bot, db, job_id, control=control)
+
+    job = await db.get_broadcast_job(job_id)
+    if job["status"] == "done":
+        await notify_job_finished(bot, job)
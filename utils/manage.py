@@ -0,0 +1,149 @@
+import logging
+from typing import Any, Callable, Dict, List
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import DeleteMessages, EditMessageCaption, EditMessageText
+
+from utils.broadcast import DeliveryEngine
+
+logger = logging.getLogger(__name__)
+
+# Share of the rate budget of a recall / edit (regular broadcasts get 1),
+# so a correction overtakes the broadcasts still running
+MANAGE_WEIGHT = 2
+
+# Message types without a caption to edit
+NOT_EDITABLE_TYPES = {"sticker", "video_note", "dice", "location", "venue", "contact", "poll"}
+
+
+class ManageError(Exception):
+    """Raised when a broadcast can't be recalled or edited"""
+
+
+async def _load_job(db, job_id: int) -> Dict:
+    job = await db.get_broadcast_job(job_id)
+
+    if not job:
+        raise ManageError("Broadcast not found!")
+
+    if job["status"] not in ("done", "cancelled"):
+        raise ManageError("Broadcast is still in progress!")
+
+    return job
+
+
+async def recall_broadcast(
+    bot: Bot,
+    db,
+    job_id: int,
+    on_progress: Callable[[Dict[str, int]], None] | None = None
+) -> Dict[str, int]:
+    """
+    Delete a sent broadcast from every chat it was delivered to.
+    Only the stored ids are deleted, one deleteMessages call per chat
+    for a whole album.
+    """
+    await _load_job(db, job_id)
+
+    messages = {
+        row["chat_id"]: row["message_ids"]
+        for row in await db.get_delivered_messages(job_id)
+    }
+    recalled: List[int] = []
+
+    async def send(chat_id: int):
+        # Migrated groups are retried with the new id by the engine
+        message_ids = messages.get(chat_id) or messages[_original_id(engine, chat_id)]
+        return await bot(DeleteMessages(chat_id=chat_id, message_ids=message_ids))
+
+    def on_result(chat_id: int, ok: bool, result: Any):
+        if ok:
+            recalled.append(chat_id)
+
+    engine = DeliveryEngine(
+        send,
+        on_result=on_result,
+        on_progress=on_progress,
+        flow=("recall", job_id),
+        weight=MANAGE_WEIGHT
+    )
+    stats = await engine.run(messages)
+
+    if recalled:
+        await db.mark_deliveries(job_id, recalled, "recalled")
+
+    logger.info(f"🗑 Broadcast #{job_id} recalled from {len(recalled)} chats")
+    return stats
+
+
+async def edit_broadcast(
+    bot: Bot,
+    db,
+    job_id: int,
+    new_text: str,
+    on_progress: Callable[[Dict[str, int]], None] | None = None
+) -> Dict[str, int]:
+    """
+    Replace the text (or caption) of a sent broadcast in every chat.
+    `new_text` is HTML. Only copied broadcasts can be edited:
+    forwarded messages belong to their original author.
+    """
+    job = await _load_job(db, job_id)
+
+    if job["send_mode"] == "forward":
+        raise ManageError("Forwarded broadcasts can't be edited!")
+
+    if job["message_type"] in NOT_EDITABLE_TYPES:
+        raise ManageError("This message type has no text to edit!")
+
+    is_text = job["message_type"] == "text"
+
+    messages = {
+        row["chat_id"]: row["message_id"]
+        for row in await db.get_delivered_messages(job_id)
+    }
+
+    async def send(chat_id: int):
+        # Albums carry the caption on their first message
+        message_id = messages.get(chat_id) or messages[_original_id(engine, chat_id)]
+
+        if is_text:
+            method = EditMessageText(
+                chat_id=chat_id, message_id=message_id,
+                text=new_text, parse_mode="HTML"
+            )
+        else:
+            method = EditMessageCaption(
+                chat_id=chat_id, message_id=message_id,
+                caption=new_text, parse_mode="HTML"
+            )
+
+        try:
+            return await bot(method)
+        except TelegramBadRequest as e:
+            # Already has this text, e.g. a repeated edit
+            if "message is not modified" in str(e).lower():
+                return True
+            raise
+
+    engine = DeliveryEngine(
+        send,
+        on_progress=on_progress,
+        flow=("edit", job_id),
+        weight=MANAGE_WEIGHT
+    )
+    stats = await engine.run(messages)
+
+    await db.set_broadcast_job_text(job_id, new_text)
+
+    logger.info(f"✏️ Broadcast #{job_id} edited in {stats['success']} chats")
+    return stats
+
+
+def _original_id(engine: DeliveryEngine, target_id: int) -> int:
+    """Chat id stored in the deliveries for a migrated supergroup id"""
+    for old_id, new_id in engine.migrated.items():
+        if new_id == target_id:
+            return old_id
+    return target_id
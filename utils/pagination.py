@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+# Rows per page in list views (20 long titles could pass 4096 chars)
+PAGE_SIZE = 10
+
+_EPOCH = datetime(1970, 1, 1)
+
+# (timestamp, id) of a row in keyset order
+PageKey = Tuple[datetime, int]
+
+
+def encode_key(direction: str, timestamp: datetime, row_id: int) -> str:
+    """
+    Compact keyset cursor for callback data (64 bytes max):
+    "a" = rows after the key, "b" = rows before it.
+    """
+    micros = (timestamp - _EPOCH) // timedelta(microseconds=1)
+    return f"{direction}{micros}.{row_id}"
+
+
+def decode_key(key: str) -> Tuple[Optional[PageKey], Optional[PageKey]]:
+    """
+    Inverse of encode_key: (after, before), one of them None.
+    """
+    direction, key = key[0], key[1:]
+    micros, row_id = key.split(".")
+    key = (_EPOCH + timedelta(microseconds=int(micros)), int(row_id))
+
+    if direction == "a":
+        return key, None
+    return None, key
+
+
+def parse_page(data: str) -> Tuple[int, Optional[PageKey], Optional[PageKey]]:
+    """
+    Parse "<prefix>_page_<n>[_<key>]" into (page, after, before).
+    """
+    parts = data.split("_page_", 1)[1].split("_")
+    page = int(parts[0])
+
+    if len(parts) < 2:
+        return page, None, None
+
+    return (page, *decode_key(parts[1]))
+
+
+def page_keys(rows: list, time_field: str, id_field: str) -> Tuple[str, str]:
+    """
+    Cursors to the previous and next pages around `rows`.
+    """
+    first, last = rows[0], rows[-1]
+    return (
+        encode_key("b", first[time_field], first[id_field]),
+        encode_key("a", last[time_field], last[id_field])
+    )
+
+
+def total_pages(total: int, size: int = PAGE_SIZE) -> int:
+    return max(1, -(-total // size))
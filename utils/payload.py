@@ -0,0 +1,108 @@
+import asyncio
+from typing import Any, List
+from urllib.parse import urlencode
+
+from aiohttp import ClientError
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.exceptions import TelegramNetworkError
+from aiogram.methods import TelegramMethod
+
+_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def result_message_ids(result: Any) -> List[int]:
+    """
+    Message ids from a send result: raw dict, list of dicts (albums)
+    or an aiogram object, in the order Telegram returned them.
+    Album ids are not assumed to be consecutive.
+    """
+    if isinstance(result, list):
+        return [i for item in result for i in result_message_ids(item)]
+
+    if isinstance(result, dict):
+        message_id = result.get("message_id")
+    else:
+        message_id = getattr(result, "message_id", None)
+
+    return [] if message_id is None else [message_id]
+
+
+class PreparedRequest:
+    """
+    Telegram API request serialized once and reused for every recipient.
+
+    aiogram validates and encodes a new method object for every call,
+    although in a broadcast only `chat_id` changes. Here the body is
+    encoded once and `chat_id` is prepended per send.
+    """
+
+    def __init__(self, bot: Bot, method: TelegramMethod):
+        self.bot = bot
+        self.method = method
+
+        session = bot.session
+        fields = {}
+
+        for key, value in method.model_dump(warnings=False).items():
+            if key == "chat_id":
+                continue
+
+            value = session.prepare_value(value, bot=bot, files={})
+            if not value:
+                continue
+
+            fields[key] = value
+
+        self._body = urlencode(fields).encode()
+        self._url = session.api.api_url(token=bot.token, method=method.__api_method__)
+
+    def body(self, chat_id: int) -> bytes:
+        """Request body for one recipient"""
+        return b"chat_id=%d&" % chat_id + self._body
+
+    async def send(self, chat_id: int) -> Any:
+        """
+        Send the request to one chat.
+        Returns the raw `result` of the API response (dict or list).
+        Errors are raised as the usual aiogram exceptions.
+        """
+        session = self.bot.session
+
+        # Custom sessions only understand method objects
+        if not isinstance(session, AiohttpSession):
+            return await self.bot(self.method.model_copy(update={"chat_id": chat_id}))
+
+        http = await session.create_session()
+
+        try:
+            async with http.post(
+                self._url,
+                data=self.body(chat_id),
+                headers=_HEADERS,
+                timeout=session.timeout
+            ) as resp:
+                status = resp.status
+                raw_result = await resp.text()
+        except asyncio.TimeoutError as e:
+            raise TelegramNetworkError(method=self.method, message="Request timeout error") from e
+        except ClientError as e:
+            raise TelegramNetworkError(method=self.method, message=f"{type(e).__name__}: {e}") from e
+
+        # Fast path: skip building pydantic models for successful sends
+        try:
+            data = session.json_loads(raw_result)
+        except ValueError:
+            data = None
+
+        if status == 200 and isinstance(data, dict) and data.get("ok"):
+            return data["result"]
+
+        # Raises the matching Telegram* exception
+        response = session.check_response(
+            bot=self.bot,
+            method=self.method,
+            status_code=status,
+            content=raw_result
+        )
+        return response.result
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Dict
+
+from aiogram.types import Message
+
+import config
+from keyboards import broadcast_control_keyboard
+from utils.control import BroadcastControl
+from utils.rate_limit import dispatcher
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+class BroadcastProgress:
+    """
+    Live progress message edited in place.
+
+    `update(stats)` is cheap and may be called after every send;
+    the message itself is edited at most once per `interval` seconds
+    and each edit takes a token from the priority lane of the dispatcher.
+    """
+
+    def __init__(
+        self,
+        message: Message,
+        title: str,
+        control: BroadcastControl | None = None,
+        interval: float | None = None,
+        action: str = "Sending to"
+    ):
+        self.message = message
+        self.title = title
+        self.action = action
+        self.control = control
+        self.interval = interval or config.BROADCAST_PROGRESS_INTERVAL
+
+        self._stats: Dict[str, int] = {"total": 0, "success": 0, "failed": 0}
+        self._dirty = False
+        self._started = time.monotonic()
+        self._task: asyncio.Task | None = None
+
+    def update(self, stats: Dict[str, int]):
+        self._stats = stats
+        self._dirty = True
+
+    def render(self) -> str:
+        total = self._stats["total"]
+        success = self._stats["success"]
+        failed = self._stats["failed"]
+        done = success + failed
+        remaining = total - done
+
+        elapsed = time.monotonic() - self._started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = format_duration(remaining / rate) if rate > 0 else "—"
+
+        header = (
+            f"⏸ Paused: <b>{self.title}</b>"
+            if self.control and self.control.paused
+            else f"⏳ {self.action} <b>{self.title}</b>..."
+        )
+
+        return (
+            f"{header}\n\n"
+            f"✅ Sent: <b>{success}</b>\n"
+            f"❌ Failed: <b>{failed}</b>\n"
+            f"📋 Remaining: <b>{remaining}</b> of {total}\n"
+            f"🚀 Rate: <b>{rate:.1f}</b> msg/s\n"
+            f"🕒 ETA: <b>{eta}</b>"
+        )
+
+    def reply_markup(self):
+        if not self.control:
+            return None
+
+        return broadcast_control_keyboard(self.control.job_id, self.control.paused)
+
+    async def _refresh(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            if not self._dirty:
+                continue
+
+            self._dirty = False
+            await dispatcher.acquire(priority=True)
+
+            try:
+                await self.message.edit_text(
+                    self.render(),
+                    parse_mode="HTML",
+                    reply_markup=self.reply_markup()
+                )
+            except Exception:
+                # "message is not modified" or message deleted
+                pass
+
+    async def __aenter__(self):
+        self._started = time.monotonic()
+        self._task = asyncio.create_task(self._refresh())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable
+
+import config
+
+
+class TokenBucket:
+    """
+    Global token bucket limiter.
+    Holds the whole bot at `rate` messages per second.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def pause(self, seconds: float):
+        """
+        Stop handing out tokens for `seconds`
+        (used when Telegram answers with a flood-wait).
+        """
+        self._paused_until = max(
+            self._paused_until,
+            time.monotonic() + seconds
+        )
+
+    async def acquire(self):
+        """Wait until one token is available and take it."""
+        async with self._lock:
+            while True:
+                paused_for = self._paused_until - time.monotonic()
+                if paused_for > 0:
+                    await asyncio.sleep(paused_for)
+                    continue
+
+                self._refill()
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ChatRateLimiter:
+    """
+    Per-chat limiter.
+    Keeps a minimum interval between two messages to the same chat
+    (groups and channels are much stricter than private chats).
+    """
+
+    def __init__(self, group_interval: float, private_interval: float = 1.0):
+        self.group_interval = group_interval
+        self.private_interval = private_interval
+        self._next_at: Dict[int, float] = {}
+
+    def _cleanup(self, now: float):
+        for chat_id in [c for c, t in self._next_at.items() if t <= now]:
+            del self._next_at[chat_id]
+
+    async def acquire(self, chat_id: int):
+        """Wait until the chat may receive the next message."""
+        now = time.monotonic()
+
+        if len(self._next_at) > 10_000:
+            self._cleanup(now)
+
+        interval = self.group_interval if chat_id < 0 else self.private_interval
+        start_at = max(self._next_at.get(chat_id, 0.0), now)
+        self._next_at[chat_id] = start_at + interval
+
+        delay = start_at - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SendDispatcher:
+    """
+    Process-wide dispatcher of outbound sends.
+
+    A single pump takes tokens from the global bucket and hands them out:
+      1. to the priority lane first (system notifications, progress edits)
+      2. then by weighted round-robin across active flows (broadcasts):
+         a flow with weight N gets N sends per round.
+    Total throughput stays at the bucket rate and a huge broadcast
+    can't starve the others.
+    """
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+
+        self._priority: Deque[asyncio.Future] = deque()
+        self._flows: Dict[Hashable, Deque[asyncio.Future]] = {}
+        self._weights: Dict[Hashable, int] = {}
+        self._ring: Deque[Hashable] = deque()
+        self._credit = 0
+
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def set_weight(self, flow: Hashable, weight: int):
+        self._weights[flow] = max(1, int(weight))
+
+    def remove_flow(self, flow: Hashable):
+        self._weights.pop(flow, None)
+
+    async def acquire(self, flow: Hashable = None, priority: bool = False):
+        """Wait for this flow's turn to send one message."""
+        waiter = asyncio.get_running_loop().create_future()
+
+        if priority:
+            self._priority.append(waiter)
+        else:
+            queue = self._flows.get(flow)
+            if queue is None:
+                queue = self._flows[flow] = deque()
+                self._ring.append(flow)
+            queue.append(waiter)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._pump())
+
+        self._wakeup.set()
+        await waiter
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        while self._priority:
+            waiter = self._priority.popleft()
+            if not waiter.done():
+                return waiter
+
+        while self._ring:
+            flow = self._ring[0]
+            queue = self._flows[flow]
+
+            # Drop waiters whose senders were cancelled
+            while queue and queue[0].done():
+                queue.popleft()
+
+            if not queue:
+                self._ring.popleft()
+                del self._flows[flow]
+                self._credit = 0
+                continue
+
+            if self._credit <= 0:
+                self._credit = self._weights.get(flow, 1)
+
+            self._credit -= 1
+            if self._credit == 0:
+                self._ring.rotate(-1)
+
+            return queue.popleft()
+
+        return None
+
+    async def _pump(self):
+        while True:
+            if not self._priority and not self._ring:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await self.bucket.acquire()
+
+            waiter = self._next_waiter()
+            if waiter:
+                waiter.set_result(None)
+
+
+# Shared by every broadcast in this process
+global_limiter = TokenBucket(config.BROADCAST_RATE)
+chat_limiter = ChatRateLimiter(config.BROADCAST_CHAT_INTERVAL)
+dispatcher = SendDispatcher(global_limiter)
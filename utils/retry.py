@@ -0,0 +1,85 @@
+import asyncio
+import random
+
+from aiohttp import ClientError
+from aiogram.exceptions import (
+    TelegramRetryAfter,
+    TelegramMigrateToChat,
+    TelegramNetworkError,
+    TelegramServerError,
+    TelegramForbiddenError,
+    TelegramBadRequest,
+    TelegramNotFound
+)
+
+# Delivery error kinds
+FLOOD = "flood"            # 429, wait `retry_after` and try again
+TRANSIENT = "transient"    # network / server error, retry with backoff
+PERMANENT = "permanent"    # forbidden, chat not found, bad request
+MIGRATE = "migrate"        # group was upgraded to a supergroup
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Sort a send error into one of the delivery error kinds.
+    """
+    if isinstance(error, TelegramRetryAfter):
+        return FLOOD
+
+    if isinstance(error, TelegramMigrateToChat):
+        return MIGRATE
+
+    if isinstance(error, (TelegramNetworkError, TelegramServerError)):
+        return TRANSIENT
+
+    if isinstance(error, (asyncio.TimeoutError, ClientError, ConnectionError)):
+        return TRANSIENT
+
+    if isinstance(error, (TelegramForbiddenError, TelegramBadRequest, TelegramNotFound)):
+        return PERMANENT
+
+    return PERMANENT
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter.
+    attempt=1 → up to 1s, attempt=2 → up to 2s, attempt=3 → up to 4s ...
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+# Errors meaning the chat itself is gone for the bot
+_DEAD_CHAT_MARKERS = (
+    "bot was kicked",
+    "bot is not a member",
+    "group chat was deactivated",
+    "chat was deleted"
+)
+
+
+def is_dead_chat_error(error: Exception) -> bool:
+    """
+    True if the chat should no longer receive broadcasts
+    (bot blocked / kicked, chat deleted).
+    "chat not found" is left out: it may be about from_chat_id.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return True
+
+    if isinstance(error, (TelegramBadRequest, TelegramNotFound)):
+        text = str(error).lower()
+        return any(marker in text for marker in _DEAD_CHAT_MARKERS)
+
+    return False
+
+
+def is_chat_not_found(error: Exception) -> bool:
+    """
+    "chat not found": either the target chat or the source chat of a
+    copy / forward is gone, the error doesn't say which.
+    """
+    return (
+        isinstance(error, (TelegramBadRequest, TelegramNotFound))
+        and "chat not found" in str(error).lower()
+    )
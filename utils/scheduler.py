@@ -0,0 +1,162 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from aiogram import Bot
+
+import config
+from utils.cron import CronRule
+from utils.jobs import (
+    get_target_chat_ids,
+    run_in_background,
+    run_broadcast_job,
+    notify_job_finished
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastScheduler:
+    """
+    In-process scheduler for scheduled and recurring broadcasts.
+
+    All active schedules live in one timer heap ordered by next run.
+    A single task sleeps until the earliest entry (minus the prefetch
+    window), so nothing polls per schedule. Target chats are resolved
+    and the job is created during the prefetch window, then the job is
+    started exactly at fire time.
+    """
+
+    def __init__(self, bot: Bot, db, prefetch: float | None = None):
+        self.bot = bot
+        self.db = db
+        self.prefetch = timedelta(
+            seconds=config.SCHEDULE_PREFETCH if prefetch is None else prefetch
+        )
+
+        self._heap: List[Tuple[datetime, int]] = []
+        self._schedules: Dict[int, Dict] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> int:
+        """Load active schedules and start the timer. Returns their count."""
+        for schedule in await self.db.get_active_schedules():
+            self._push(schedule)
+
+        self._task = asyncio.create_task(self._run())
+        return len(self._schedules)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def add(self, schedule: Dict):
+        self._push(schedule)
+        self._wakeup.set()
+
+    def remove(self, schedule_id: int):
+        # Heap entry is dropped lazily when it reaches the top
+        self._schedules.pop(schedule_id, None)
+
+    def _push(self, schedule: Dict):
+        self._schedules[schedule["id"]] = schedule
+        heapq.heappush(self._heap, (schedule["next_run"], schedule["id"]))
+
+    def _is_stale(self, entry: Tuple[datetime, int]) -> bool:
+        next_run, schedule_id = entry
+        schedule = self._schedules.get(schedule_id)
+        return schedule is None or schedule["next_run"] != next_run
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+
+            while self._heap and self._is_stale(self._heap[0]):
+                heapq.heappop(self._heap)
+
+            timeout = None
+
+            if self._heap:
+                fire_at, schedule_id = self._heap[0]
+                timeout = (fire_at - self.prefetch - datetime.now()).total_seconds()
+
+                if timeout <= 0:
+                    heapq.heappop(self._heap)
+                    schedule = self._schedules.pop(schedule_id)
+                    next_schedule = self._advance(schedule)
+                    run_in_background(self._fire(schedule, next_schedule))
+                    continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _advance(self, schedule: Dict) -> Dict | None:
+        """Put the next occurrence of a recurring schedule on the heap."""
+        if not schedule["cron"]:
+            return None
+
+        after = max(schedule["next_run"], datetime.now())
+        next_schedule = {
+            **schedule,
+            "next_run": CronRule(schedule["cron"]).next_after(after)
+        }
+        self._push(next_schedule)
+        return next_schedule
+
+    async def _fire(self, schedule: Dict, next_schedule: Dict | None):
+        schedule_id = schedule["id"]
+
+        try:
+            if schedule["target"] == "selected":
+                chat_ids = list(schedule["chat_ids"] or [])
+            else:
+                chat_ids = get_target_chat_ids(self.db, schedule["target"])
+
+            # Pre-computed job: deliveries exist, workers ignore it until started
+            job_id = await self.db.create_broadcast_job(
+                admin_id=schedule["admin_id"],
+                source_chat_id=schedule["source_chat_id"],
+                source_message_id=schedule["source_message_id"],
+                send_mode=schedule["send_mode"],
+                chat_ids=chat_ids,
+                message_type=schedule["message_type"],
+                message_text=schedule["message_text"],
+                album_message_ids=schedule["album_message_ids"],
+                status="scheduled",
+                delivery_mode="external" if config.BROADCAST_EXTERNAL_SENDERS else "local"
+            )
+
+            delay = (schedule["next_run"] - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            await self.db.start_scheduled_job(job_id)
+
+            if next_schedule:
+                await self.db.set_schedule_next_run(schedule_id, next_schedule["next_run"])
+            else:
+                await self.db.deactivate_schedule(schedule_id)
+
+            logger.info(f"⏰ Scheduled broadcast #{schedule_id} started as job #{job_id}")
+
+            # Sender workers pick the job up themselves
+            if config.BROADCAST_EXTERNAL_SENDERS:
+                return
+
+            stats = await run_broadcast_job(self.bot, self.db, job_id)
+            await notify_job_finished(
+                self.bot,
+                {"id": job_id, "admin_id": schedule["admin_id"], **stats}
+            )
+
+        except Exception as e:
+            logger.error(f"Scheduled broadcast #{schedule_id} failed: {e}")
@@ -0,0 +1,60 @@
+from typing import Dict, Iterable, List, Optional
+
+
+class ChatSelection:
+    """
+    Manual chat selection of one chat type, kept in FSM data.
+
+    Stored as a mode plus exceptions: with `all` off the selected chats
+    are `ids`, with `all` on they are every chat of the type except
+    `ids`. Toggling one chat is a set operation; "all of type" and
+    "invert" only flip the mode, whatever the number of chats.
+    """
+
+    def __init__(self, chat_type: Optional[str] = None, all: bool = False, ids: Iterable[int] = ()):
+        self.chat_type = chat_type
+        self.all = all
+        self.ids = set(ids)
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "ChatSelection":
+        selection = data.get("selection") or {}
+        return cls(selection.get("type"), selection.get("all", False), selection.get("ids", ()))
+
+    def to_data(self) -> Dict:
+        return {"selection": {"type": self.chat_type, "all": self.all, "ids": list(self.ids)}}
+
+    def is_selected(self, chat_id: int) -> bool:
+        return self.all != (chat_id in self.ids)
+
+    def toggle(self, chat_id: int) -> bool:
+        """Flip one chat; returns whether it is selected now"""
+        self.ids ^= {chat_id}
+        return self.is_selected(chat_id)
+
+    def set_many(self, chat_ids: Iterable[int], selected: bool = True):
+        if selected == self.all:
+            self.ids.difference_update(chat_ids)
+        else:
+            self.ids.update(chat_ids)
+
+    def select_all(self):
+        self.all, self.ids = True, set()
+
+    def invert(self):
+        self.all = not self.all
+
+    def count(self, total: int) -> int:
+        """Number of selected chats, `total` being the chats of the type"""
+        return total - len(self.ids) if self.all else len(self.ids)
+
+    def total(self, db) -> int:
+        return db.count_active_chats(self.chat_type)
+
+    def resolve(self, db) -> List[int]:
+        """Selected chat ids (only active chats when `all` is on)"""
+        if not self.all:
+            return list(self.ids)
+
+        chat_ids = db.get_active_chat_ids(self.chat_type)
+        return [chat_id for chat_id in chat_ids if chat_id not in self.ids]
@@ -10,6 +10,10 @@ class BroadcastStates(StatesGroup):
     select_target = State()
     selecting_chats = State()  
     confirm = State()
+    schedule_time = State()
+    confirm_cancel = State()
+    edit_text = State()
+    manage_pin = State()
 
 
 class AdminStates(StatesGroup):
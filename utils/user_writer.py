@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# (user_id, username, full_name)
+UserInfo = Tuple[int, Optional[str], Optional[str]]
+
+
+class UserWriter:
+    """
+    Write-behind buffer for /start registrations.
+
+    `add()` returns immediately; users are coalesced by id and upserted
+    in one statement every `interval` seconds (or as soon as
+    `batch_size` users are waiting). `on_new` is awaited with the users
+    that turned out to be new.
+    """
+
+    def __init__(
+        self,
+        db,
+        on_new: Callable[[List[UserInfo]], Awaitable] | None = None,
+        batch_size: int | None = None,
+        interval: float | None = None
+    ):
+        self.db = db
+        self.on_new = on_new
+        self.batch_size = batch_size or config.USER_WRITE_BATCH
+        self.interval = interval or config.USER_WRITE_INTERVAL
+
+        # Latest name per user wins
+        self._buffer: Dict[int, UserInfo] = {}
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+
+    def add(self, user_id: int, username: Optional[str], full_name: Optional[str]):
+        self._buffer[user_id] = (user_id, username, full_name)
+
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, {}
+            user_ids, usernames, full_names = map(list, zip(*batch.values()))
+
+            try:
+                new_ids = await self.db.add_users(user_ids, usernames, full_names)
+            except Exception as e:
+                logger.error(f"Failed to save {len(batch)} user(s): {e}")
+                # Newer entries added meanwhile take precedence
+                self._buffer = {**batch, **self._buffer}
+                return
+
+        if new_ids and self.on_new:
+            try:
+                await self.on_new([batch[user_id] for user_id in new_ids])
+            except Exception as e:
+                logger.error(f"New user callback failed: {e}")
+
+    async def _flusher(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._full.clear()
+            await self.flush()
+
+    async def start(self):
+        self._closed = False
+        self._task = asyncio.create_task(self._flusher())
+
+    async def stop(self):
+        self._closed = True
+        self._full.set()
+
+        if self._task:
+            await self._task
+            self._task = None
+
+        await self.flush()